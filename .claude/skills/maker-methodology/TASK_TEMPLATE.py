@@ -21,11 +21,24 @@ class TaskState:
     - For code refactoring: current code, test status
     - For planning: current location, visited nodes
     - For proof: current statement, applied rules
+
+    Prefer a structure-of-arrays layout for hot state: flat buffers and
+    per-constraint masks rather than nested lists of objects. MAKER
+    re-reads state on every agent vote, so cache-friendly fields pay off
+    (see example_sudoku.py for the applied version).
     """
     # TODO: Add your state fields here
-    # Example:
-    # grid: List[List[int]]
-    # empty_cells: List[Tuple[int, int]]
+    # Example (SoA layout):
+    # grid_flat: bytearray        # or np.ndarray[uint8]; row-major cells
+    # row_mask: List[int]         # bit n set => value n used in that row
+    # col_mask: List[int]
+    # box_mask: List[int]
+    # empty_stack: List[int]      # flat indices, next cell to fill on top
+    #
+    # Add @dataclass(slots=True) and a factory that derives all masks in
+    # a single pass over the input:
+    # @classmethod
+    # def from_grid(cls, grid): ...
     pass
 
 
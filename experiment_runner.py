@@ -0,0 +1,65 @@
+"""
+Concurrent runner for batches of independent MAKER solves.
+
+A single solve is strictly sequential — every step depends on the state
+left by the previous one — but experiment sweeps (different disk counts,
+different models, different k) are embarrassingly parallel. The runner
+drives many solves at once, with an optional token-bucket rate limit to
+stay under the provider's ceiling. HTTP connection pooling is handled
+inside each solve: async clients must live and die with the event loop
+of the thread making the requests (see maker._loop_scoped_aclient), so
+the runner deliberately installs no process-wide client.
+"""
+
+import asyncio
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from aiolimiter import AsyncLimiter
+except ImportError:
+    AsyncLimiter = None
+
+from maker import MAKER, MAKERConfig
+
+
+class ExperimentRunner:
+    """Run a list of (MAKERConfig, num_disks) experiments concurrently."""
+
+    def __init__(self, experiments: Iterable[Tuple[MAKERConfig, int]],
+                 max_concurrency: int = 4,
+                 solves_per_minute: Optional[float] = None):
+        self.experiments = list(experiments)
+        self.max_concurrency = max_concurrency
+
+        # Token bucket gating solve admission; per-request limits belong
+        # to the provider router, not here.
+        self._limiter = None
+        if solves_per_minute is not None:
+            if AsyncLimiter is None:
+                raise RuntimeError(
+                    "Rate limiting requires aiolimiter. "
+                    "Install with: pip install aiolimiter")
+            self._limiter = AsyncLimiter(solves_per_minute, 60)
+
+    async def _run_one(self, semaphore: asyncio.Semaphore,
+                       config: MAKERConfig, num_disks: int):
+        async with semaphore:
+            if self._limiter is not None:
+                await self._limiter.acquire()
+            maker = MAKER(config)
+            # solve_towers_of_hanoi is synchronous; running it in a
+            # worker thread keeps the loop free to overlap the other
+            # instances' network round-trips.
+            return await asyncio.to_thread(
+                maker.solve_towers_of_hanoi, num_disks)
+
+    async def run_async(self) -> List[Tuple[bool, List[Tuple[str, str]], Dict]]:
+        """Run all experiments; results are in input order."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(
+            *[self._run_one(semaphore, config, num_disks)
+              for config, num_disks in self.experiments])
+
+    def run(self) -> List[Tuple[bool, List[Tuple[str, str]], Dict]]:
+        """Synchronous entry point around run_async."""
+        return asyncio.run(self.run_async())
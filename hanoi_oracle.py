@@ -0,0 +1,39 @@
+"""
+Closed-form move oracle for Towers of Hanoi.
+
+The optimal move sequence is fully determined by the step index, so for
+benchmarking and regression runs there is no need to spend an LLM voting
+round rediscovering it. Plug `state_oracle` into `MAKERConfig.oracle` to
+have the voting layer return the ground-truth move directly — useful as
+an upper bound when measuring how close voting converges to optimal, or
+as a verify-only mode.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+from towers_of_hanoi import GameState, get_optimal_solution
+
+
+@lru_cache(maxsize=None)
+def _move_table(num_disks: int, source: str, target: str,
+                auxiliary: str) -> Tuple[Tuple[str, str], ...]:
+    """Full optimal move list for one peg labelling, computed once."""
+    return tuple(get_optimal_solution(num_disks, source, target, auxiliary))
+
+
+def hanoi_move(step_num: int, num_disks: int, source: str = 'A',
+               target: str = 'C', auxiliary: str = 'B') -> Tuple[str, str]:
+    """
+    Return the optimal move for 1-based step `step_num`.
+
+    The table for a given (num_disks, pegs) labelling is generated on
+    first use and cached, so repeated lookups are a tuple index.
+    """
+    return _move_table(num_disks, source, target, auxiliary)[step_num - 1]
+
+
+def state_oracle(state: GameState, step_num: int) -> Tuple[str, str]:
+    """Adapter matching the MAKERConfig.oracle(state, step_num) signature."""
+    return hanoi_move(step_num, state.num_disks,
+                      state.source, state.target, state.auxiliary)
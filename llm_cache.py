@@ -0,0 +1,172 @@
+"""
+Exact-match response cache for LLM calls.
+
+Within a single MAKER solve the same (state, step) prompt is issued by
+every voting agent, and across solves the early puzzle states repeat
+verbatim. Caching responses by the exact request payload turns those
+repeats into dictionary lookups instead of network round-trips.
+
+For temperature > 0 the cache keeps a bounded list of samples per key
+and hands them out round-robin, so agents still see diverse responses
+drawn from the stored sample set.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+
+class LLMCache:
+    """LRU cache keyed on the exact request payload, with optional disk tier."""
+
+    def __init__(self, max_entries: int = 10000, max_samples_per_key: int = 8,
+                 cache_dir: Optional[str] = None, save_every: int = 50):
+        self._entries: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._cursor: Dict[str, int] = {}  # Round-robin position per key
+        self.max_entries = max_entries
+        self.max_samples_per_key = max_samples_per_key
+        self.save_every = save_every
+        self.stats = {"hits": 0, "misses": 0}
+
+        self._disk_path = None
+        self._puts_since_save = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_path = os.path.join(cache_dir, "responses.json")
+            self._load_disk()
+
+    @staticmethod
+    def make_key(**request) -> str:
+        """Stable key over the full request payload."""
+        payload = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached sample for key (round-robin), or None on miss.
+
+        A key counts as a miss until it holds max_samples_per_key
+        samples: serving the lone first response to every agent would
+        collapse a k-vote to a single draw, so underfilled keys keep
+        going to the provider (put() grows the sample list) and only a
+        full list is handed out round-robin.
+        """
+        samples = self._entries.get(key)
+        if not samples or len(samples) < self.max_samples_per_key:
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        cursor = self._cursor.get(key, 0)
+        self._cursor[key] = (cursor + 1) % len(samples)
+        self.stats["hits"] += 1
+        return samples[cursor % len(samples)]
+
+    def put(self, key: str, response: str) -> None:
+        """Store one sample for key, evicting the LRU entry when full."""
+        samples = self._entries.get(key)
+        if samples is None:
+            if len(self._entries) >= self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._cursor.pop(evicted, None)
+            self._entries[key] = [response]
+        elif len(samples) < self.max_samples_per_key:
+            samples.append(response)
+        self._entries.move_to_end(key)
+
+        if self._disk_path is not None:
+            self._puts_since_save += 1
+            if self._puts_since_save >= self.save_every:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the in-memory tier to disk (no-op without a cache_dir)."""
+        if self._disk_path is None:
+            return
+        tmp_path = self._disk_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(dict(self._entries), f)
+        os.replace(tmp_path, self._disk_path)
+        self._puts_since_save = 0
+
+    def _load_disk(self) -> None:
+        """Load the disk tier if present; ignore unreadable files."""
+        try:
+            with open(self._disk_path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, samples in stored.items():
+            self._entries[key] = list(samples)[:self.max_samples_per_key]
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache over prompts.
+
+    Prompts that differ only in incidental detail (step number, peg
+    diagram) embed close together; a cosine-similarity lookup above a
+    high threshold short-circuits the LLM call entirely. Keep the
+    threshold high (default 0.95) — a false positive returns a move for
+    the wrong state. Requires the optional sentence-transformers and
+    faiss packages.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 5000,
+                 model_name: str = "all-MiniLM-L6-v2"):
+        if SentenceTransformer is None or faiss is None:
+            raise RuntimeError(
+                "SemanticCache requires sentence-transformers and faiss. "
+                "Install with: pip install sentence-transformers faiss-cpu")
+
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.model = SentenceTransformer(model_name)
+        self._dim = self.model.get_sentence_embedding_dimension()
+        # Inner product over L2-normalized vectors == cosine similarity
+        self.index = faiss.IndexFlatIP(self._dim)
+        self._prompts: List[str] = []
+        self._responses: List[str] = []
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _encode(self, prompt: str):
+        return self.model.encode([prompt], normalize_embeddings=True)
+
+    def get(self, prompt: str) -> Optional[str]:
+        """Return the response of the nearest prompt above threshold."""
+        if not self._responses:
+            self.stats["misses"] += 1
+            return None
+
+        scores, ids = self.index.search(self._encode(prompt), 1)
+        if scores[0][0] >= self.threshold:
+            self.stats["hits"] += 1
+            return self._responses[ids[0][0]]
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, prompt: str, response: str) -> None:
+        """Store a prompt/response pair, evicting the oldest half when full."""
+        if len(self._responses) >= self.max_entries:
+            keep = self.max_entries // 2
+            self._prompts = self._prompts[-keep:]
+            self._responses = self._responses[-keep:]
+            self.index.reset()
+            self.index.add(self.model.encode(
+                self._prompts, normalize_embeddings=True))
+
+        self.index.add(self._encode(prompt))
+        self._prompts.append(prompt)
+        self._responses.append(response)
@@ -7,22 +7,123 @@ Implements:
 3. Red-Flagging (Anomaly Detection)
 """
 
+import array
+import asyncio
+import json
+import logging
+import logging.handlers
+import queue
 import os
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Callable
 from dataclasses import dataclass
 from collections import Counter
+from contextlib import asynccontextmanager
 import re
 import math
 
 try:
-    from litellm import completion
+    import litellm
+    from litellm import completion, acompletion
 except ImportError:
+    litellm = None
     print("Warning: litellm not installed. Install with: pip install litellm")
     completion = None
+    acompletion = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 from towers_of_hanoi import GameState, parse_move, verify_solution
 
 
+logger = logging.getLogger("maker")
+_log_listener = None
+
+
+def _ensure_logging(verbose: bool) -> None:
+    """
+    Route log records through a background QueueListener so the hot
+    voting path never blocks on the stdout lock; stdio happens on the
+    listener thread. Idempotent — safe to call per MAKER instance.
+    """
+    global _log_listener
+    if _log_listener is None:
+        log_queue = queue.Queue(-1)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.propagate = False
+        _log_listener = logging.handlers.QueueListener(
+            log_queue, logging.StreamHandler())
+        _log_listener.start()
+    logger.setLevel(logging.DEBUG if verbose else logging.WARNING)
+
+
+# Compiled once: a single scan over the response replaces the per-call
+# python loop of substring tests (and the response.lower() copy).
+# Ordered by observed hit frequency (refusals dominate, "Error:" is
+# rare) so the alternation commits to the common branch first.
+_FAILURE_PATTERNS = [
+    "I cannot",
+    "I'm sorry",
+    "I can't",
+    "I apologize",
+    "I don't know",
+    "Error:",
+]
+_FAILURE_RE = re.compile(
+    "|".join(re.escape(p) for p in _FAILURE_PATTERNS), re.IGNORECASE)
+_PEG_RE = re.compile(r"[ABCabc]")
+
+
+
+def _build_failure_db():
+    """Compile the failure patterns into a Hyperscan database, if available."""
+    if hyperscan is None:
+        return None
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[re.escape(p).encode() for p in _FAILURE_PATTERNS],
+        ids=list(range(len(_FAILURE_PATTERNS))),
+        flags=[hyperscan.HS_FLAG_CASELESS] * len(_FAILURE_PATTERNS),
+    )
+    return db
+
+
+_FAILURE_DB = _build_failure_db()
+
+
+def _failure_match(response: str):
+    """First failure pattern found in response, or None.
+
+    Uses the Hyperscan DFA (single SIMD scan over all patterns, caseless,
+    no lowercased copy) when the optional binding is installed, otherwise
+    the compiled re alternation.
+    """
+    if _FAILURE_DB is not None:
+        hits = []
+
+        def on_match(pat_id, start, end, flags, ctx=None):
+            hits.append(pat_id)
+            return True  # Terminate scan at the first hit
+
+        try:
+            _FAILURE_DB.scan(response.encode(), match_event_handler=on_match)
+        except hyperscan.ScanTerminated:
+            pass
+        if hits:
+            return _FAILURE_PATTERNS[hits[0]]
+        return None
+
+    match = _FAILURE_RE.search(response)
+    return match.group(0) if match else None
+
+
 @dataclass
 class MAKERConfig:
     """Configuration for MAKER system."""
@@ -33,6 +134,36 @@ class MAKERConfig:
     temperature: float = 0.7  # Sampling temperature
     max_resamples: int = 5  # Max resamples if red-flagged
     verbose: bool = True  # Print progress
+    response_cache: Optional[Any] = None  # LLMCache instance (see llm_cache.py)
+    # SemanticCache instance; leave None for correctness-sensitive runs
+    # since a near-duplicate hit can return a move for the wrong state.
+    semantic_cache: Optional[Any] = None
+    # Request n samples per HTTP call instead of one call per agent
+    # (shares prompt processing server-side); falls back to per-agent
+    # sampling on providers that reject the n parameter.
+    use_n_param: bool = True
+    # Deterministic move oracle (state, step_num) -> move; when set, the
+    # voting layer returns its answer without any LLM calls. See
+    # hanoi_oracle.state_oracle for the Towers of Hanoi closed form.
+    oracle: Optional[Callable] = None
+    # Send only the compact peg string to the LLM; the ASCII diagram is
+    # O(disks^2) input tokens and models handle the compact form fine.
+    # Set False to restore the diagram prompt if accuracy regresses.
+    compact_prompt: bool = True
+    # Constrain decoding to a {"from","to"} JSON object so malformed
+    # moves are impossible and the resample loop never fires; disabled
+    # automatically on providers that reject response_format.
+    use_json_schema: bool = True
+    # Speculatively sample next-step votes once the current vote has a
+    # near-consensus leader (lead >= k-1), overlapping the next step's
+    # RTT with the tail of this one. Async voting path only; wrong
+    # predictions are discarded (they still warm the response cache).
+    speculate: bool = False
+    # Provider routing: one long-lived Router reuses its HTTPS
+    # connection pool across the whole run; rpm/tpm feed its limits.
+    router: Optional[Any] = None  # Auto-built when litellm is available
+    rpm: Optional[int] = None
+    tpm: Optional[int] = None
 
     @staticmethod
     def compute_k_for_steps(num_steps: int) -> int:
@@ -48,6 +179,62 @@ class MAKERConfig:
             return max(3, int(math.log(num_steps)) + 1)
 
 
+
+@asynccontextmanager
+async def _loop_scoped_aclient():
+    """Install a pooled httpx client on litellm for the current loop.
+
+    litellm.aclient_session is process-global, but an AsyncClient binds
+    its connections to the event loop that first uses them; reusing one
+    across asyncio.run boundaries fails with "Event loop is closed" as
+    soon as a keep-alive connection is picked up on the next loop. This
+    scope installs a fresh client for requests made under the current
+    loop and closes it again before the loop goes away, restoring
+    whatever was previously assigned.
+    """
+    if litellm is None or httpx is None:
+        yield
+        return
+
+    previous = getattr(litellm, "aclient_session", None)
+    limits = httpx.Limits(max_keepalive_connections=64)
+    try:
+        client = httpx.AsyncClient(http2=True, limits=limits)
+    except ImportError:  # h2 not installed
+        client = httpx.AsyncClient(limits=limits)
+    litellm.aclient_session = client
+    try:
+        yield
+    finally:
+        litellm.aclient_session = previous
+        await client.aclose()
+
+
+def _build_router(config) -> Optional[Any]:
+    """
+    Build a long-lived litellm Router for this run.
+
+    A single Router keeps one HTTPS connection pool for every agent
+    request (one TLS handshake per run instead of per call) and applies
+    the configured rpm/tpm ceilings. The async client pool is managed
+    separately by _loop_scoped_aclient, since it must live and die with
+    an event loop rather than with the process.
+    """
+    if litellm is None:
+        return None
+
+    params = {"model": config.model}
+    if config.rpm is not None:
+        params["rpm"] = config.rpm
+    if config.tpm is not None:
+        params["tpm"] = config.tpm
+
+    return litellm.Router(
+        model_list=[{"model_name": config.model, "litellm_params": params}],
+        num_retries=3,
+        timeout=30,
+    )
+
 class RedFlagger:
     """Implements red-flagging for anomaly detection."""
 
@@ -59,110 +246,330 @@ class RedFlagger:
         Check if a response should be red-flagged.
         Returns (should_flag, reason).
         """
-        # Check length
-        if len(response) > self.config.max_response_length:
-            return True, f"Response too long ({len(response)} chars)"
-
-        if len(response) < self.config.min_response_length:
-            return True, f"Response too short ({len(response)} chars)"
-
-        # Check if response is empty or whitespace only
-        if not response.strip():
+        # Checks are ordered by cost: O(1) length tests, then single
+        # C-level scans, then the compiled regexes. This runs on every
+        # response and every resample.
+        n = len(response)
+        if n > self.config.max_response_length:
+            return True, f"Response too long ({n} chars)"
+
+        if n < self.config.min_response_length:
+            return True, f"Response too short ({n} chars)"
+
+        # Whitespace-only; isspace is one pass with no stripped copy
+        if not response or response.isspace():
             return True, "Empty response"
 
-        # Check for common failure patterns
-        failure_patterns = [
-            "I cannot",
-            "I can't",
-            "I don't know",
-            "I'm sorry",
-            "I apologize",
-            "Error:",
-            "ERROR:",
-        ]
-
-        response_lower = response.lower()
-        for pattern in failure_patterns:
-            if pattern.lower() in response_lower:
-                return True, f"Failure pattern detected: {pattern}"
-
-        # Check if response contains expected format for move
-        # Should contain something like "A->B" or "A to B"
-        if not any(char in response.upper() for char in ['A', 'B', 'C']):
-            return True, "No peg names (A, B, C) found in response"
-
-        # Check for overly verbose responses (likely hallucination)
+        # Overly verbose responses (likely hallucination)
         if response.count('\n') > 5:
             return True, "Response too verbose (multiple lines)"
 
+        # Common failure patterns (one multi-pattern scan)
+        pattern = _failure_match(response)
+        if pattern is not None:
+            return True, f"Failure pattern detected: {pattern}"
+
+        # Expected move format mentions at least one peg (A->B, A to B)
+        if _PEG_RE.search(response) is None:
+            return True, "No peg names (A, B, C) found in response"
+
         return False, ""
 
 
+# The six directed moves are the complete vote space for Hanoi, so the
+# tally can live in a preallocated int array instead of a Counter.
+_MOVES = (("A", "B"), ("A", "C"), ("B", "A"),
+          ("B", "C"), ("C", "A"), ("C", "B"))
+_MOVE_IDX = {move: i for i, move in enumerate(_MOVES)}
+
+# Constrained-decoding schema: the provider's decoder can only emit a
+# syntactically valid move, which removes parse failures entirely.
+_MOVE_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "move",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "from": {"type": "string", "enum": ["A", "B", "C"]},
+                "to": {"type": "string", "enum": ["A", "B", "C"]},
+            },
+            "required": ["from", "to"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def _parse_structured_move(response_text: str) -> Optional[Tuple[str, str]]:
+    """Parse a schema-constrained {"from": ..., "to": ...} response."""
+    try:
+        data = json.loads(response_text)
+        return data["from"], data["to"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class _VoteTally:
+    """Incremental vote tally over the six Hanoi moves: counts are plain
+    C-level int increments and leader/runner-up update in O(1) per vote
+    (no Counter hashing, no most_common() sort)."""
+
+    __slots__ = ('counts', 'leader', 'leader_count', 'second_count')
+
+    def __init__(self):
+        self.counts = array.array('i', [0] * 6)
+        self.leader = None
+        self.leader_count = 0
+        self.second_count = 0
+
+    def add(self, vote) -> None:
+        idx = _MOVE_IDX[vote]
+        new_count = self.counts[idx] + 1
+        self.counts[idx] = new_count
+        if vote == self.leader:
+            self.leader_count = new_count
+        elif new_count > self.leader_count:
+            self.second_count = self.leader_count
+            self.leader, self.leader_count = vote, new_count
+        elif new_count > self.second_count:
+            self.second_count = new_count
+
+    @property
+    def lead(self) -> int:
+        return self.leader_count - self.second_count
+
+    def __bool__(self) -> bool:
+        return self.leader is not None
+
+
 class VotingAgent:
     """Individual agent that votes on next move."""
 
-    def __init__(self, config: MAKERConfig, agent_id: int = 0):
+    def __init__(self, config: MAKERConfig, agent_id: int = 0,
+                 red_flagger: Optional[RedFlagger] = None):
         self.config = config
-        self.agent_id = agent_id
-        self.red_flagger = RedFlagger(config)
-
-    def get_next_move(self, state: GameState, step_num: int) -> Optional[Tuple[str, str]]:
+        self.agent_id = agent_id  # Default label; per-call agent_id overrides
+        # Share one flagger across agents when the caller provides it
+        self.red_flagger = red_flagger if red_flagger is not None else RedFlagger(config)
+        self._schema_supported = True  # Cleared if the provider rejects it
+
+    def _wants_schema(self) -> bool:
+        return self.config.use_json_schema and self._schema_supported
+
+    def _request(self, prompt: str) -> Dict[str, Any]:
+        """Completion kwargs for one vote, with constrained decoding
+        when the provider supports it (shorter max_tokens: the whole
+        reply is a ~10-token JSON object)."""
+        request = {
+            "model": self.config.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": self.config.temperature,
+            "max_tokens": 100,  # Keep responses short
+        }
+        if self._wants_schema():
+            request["response_format"] = _MOVE_SCHEMA
+            request["max_tokens"] = 20
+        return request
+
+    def _drop_schema(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Provider rejected response_format; retry plain from now on."""
+        self._schema_supported = False
+        logger.debug("  JSON-schema decoding unavailable; falling back")
+        request = dict(request)
+        del request["response_format"]
+        request["max_tokens"] = 100
+        return request
+
+    def get_next_move(self, state: GameState, step_num: int,
+                      agent_id: Optional[int] = None,
+                      prompt: Optional[str] = None) -> Optional[Tuple[str, str]]:
         """
         Get the next move for the given state.
         Returns None if unable to get valid response after max resamples.
+        agent_id is for log attribution only; one agent instance serves
+        the whole voting loop. The caller may pass the prompt to avoid
+        re-rendering the identical string for every agent in a step.
         """
         if completion is None:
             raise RuntimeError("litellm not installed")
 
-        # Create prompt for single-step decision
-        prompt = self._create_prompt(state, step_num)
+        agent_id = self.agent_id if agent_id is None else agent_id
+
+        if prompt is None:
+            prompt = self._create_prompt(state, step_num)
 
         for attempt in range(self.config.max_resamples):
             try:
-                response = completion(
-                    model=self.config.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=self.config.temperature,
-                    max_tokens=100,  # Keep responses short
-                )
-
-                response_text = response.choices[0].message.content.strip()
-
-                # Red-flagging check
-                should_flag, reason = self.red_flagger.should_flag(
-                    response_text,
-                    {"state": state, "step": step_num}
-                )
-
-                if should_flag:
-                    if self.config.verbose:
-                        print(f"  [Agent {self.agent_id}] Red-flagged (attempt {attempt + 1}): {reason}")
-                    continue
-
-                # Parse the move
-                move = parse_move(response_text)
-                if move is None:
-                    if self.config.verbose:
-                        print(f"  [Agent {self.agent_id}] Failed to parse: '{response_text}'")
-                    continue
-
-                # Validate move is legal
-                if not state.is_valid_move(move[0], move[1]):
-                    if self.config.verbose:
-                        print(f"  [Agent {self.agent_id}] Invalid move: {move[0]}->{move[1]}")
-                    continue
+                response_text = self._complete(prompt)
+                move = self._extract_move(response_text, state, step_num, attempt,
+                                          agent_id=agent_id)
+                if move is not None:
+                    return move
 
-                return move
+            except Exception as e:
+                logger.debug("  [Agent %s] Error: %s", agent_id, e)
+                continue
+
+        return None
+
+    def _cache_key(self, prompt: str) -> Optional[str]:
+        """Cache key for this request, or None when caching is disabled."""
+        cache = self.config.response_cache
+        if cache is None:
+            return None
+        return cache.make_key(structured=self._wants_schema(),
+                              **self._request(prompt))
+
+    def _complete(self, prompt: str) -> str:
+        """Call the LLM, consulting the exact-match cache when configured."""
+        key = self._cache_key(prompt)
+        if key is not None:
+            cached = self.config.response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        semantic = self.config.semantic_cache
+        if semantic is not None:
+            cached = semantic.get(prompt)
+            if cached is not None:
+                return cached
+
+        complete = (completion if self.config.router is None
+                    else self.config.router.completion)
+        request = self._request(prompt)
+        try:
+            response = complete(**request)
+        except Exception:
+            if "response_format" not in request:
+                raise
+            response = complete(**self._drop_schema(request))
+        response_text = response.choices[0].message.content.strip()
+
+        if key is not None:
+            self.config.response_cache.put(key, response_text)
+        if semantic is not None:
+            semantic.put(prompt, response_text)
+        return response_text
+
+    async def _complete_async(self, prompt: str) -> str:
+        """Async twin of _complete using acompletion."""
+        key = self._cache_key(prompt)
+        if key is not None:
+            cached = self.config.response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        semantic = self.config.semantic_cache
+        if semantic is not None:
+            cached = semantic.get(prompt)
+            if cached is not None:
+                return cached
+
+        # stream=True so cancelling this coroutine (on early consensus)
+        # stops the server-side decode instead of billing the full reply.
+        acomplete = (acompletion if self.config.router is None
+                     else self.config.router.acompletion)
+        request = self._request(prompt)
+        try:
+            response = await acomplete(stream=True, **request)
+        except Exception:
+            if "response_format" not in request:
+                raise
+            response = await acomplete(stream=True, **self._drop_schema(request))
+        parts = []
+        async for chunk in response:
+            content = getattr(chunk.choices[0].delta, "content", None)
+            if content:
+                parts.append(content)
+        response_text = "".join(parts).strip()
+
+        if key is not None:
+            self.config.response_cache.put(key, response_text)
+        if semantic is not None:
+            semantic.put(prompt, response_text)
+        return response_text
+
+    async def get_next_move_async(self, state: GameState, step_num: int,
+                                  agent_id: Optional[int] = None,
+                                  prompt: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """
+        Async variant of get_next_move using litellm.acompletion, so the
+        voting layer can overlap the network round-trips of many agents.
+        """
+        if acompletion is None:
+            raise RuntimeError("litellm not installed")
+
+        agent_id = self.agent_id if agent_id is None else agent_id
+        if prompt is None:
+            prompt = self._create_prompt(state, step_num)
+
+        for attempt in range(self.config.max_resamples):
+            try:
+                response_text = await self._complete_async(prompt)
+                move = self._extract_move(response_text, state, step_num, attempt,
+                                          agent_id=agent_id)
+                if move is not None:
+                    return move
 
             except Exception as e:
-                if self.config.verbose:
-                    print(f"  [Agent {self.agent_id}] Error: {e}")
+                logger.debug("  [Agent %s] Error: %s", agent_id, e)
                 continue
 
         return None
 
+    def _extract_move(self, response_text: str, state: GameState,
+                      step_num: int, attempt: int,
+                      agent_id: Optional[int] = None) -> Optional[Tuple[str, str]]:
+        """Red-flag, parse, and legality-check one raw response."""
+        agent_id = self.agent_id if agent_id is None else agent_id
+
+        if self.config.use_json_schema and response_text.startswith("{"):
+            move = _parse_structured_move(response_text)
+            if move is not None:
+                # Schema-enforced format: red-flagging adds nothing
+                if not state.is_valid_move(move[0], move[1]):
+                    logger.debug("  [Agent %s] Invalid move: %s->%s",
+                                 agent_id, move[0], move[1])
+                    return None
+                return move
+
+        # Red-flagging check
+        should_flag, reason = self.red_flagger.should_flag(
+            response_text,
+            {"state": state, "step": step_num}
+        )
+
+        if should_flag:
+            logger.debug("  [Agent %s] Red-flagged (attempt %d): %s",
+                         agent_id, attempt + 1, reason)
+            return None
+
+        # Parse the move
+        move = parse_move(response_text)
+        if move is None:
+            logger.debug("  [Agent %s] Failed to parse: %r", agent_id, response_text)
+            return None
+
+        # Validate move is legal
+        if not state.is_valid_move(move[0], move[1]):
+            logger.debug("  [Agent %s] Invalid move: %s->%s", agent_id, move[0], move[1])
+            return None
+
+        return move
+
     def _create_prompt(self, state: GameState, step_num: int) -> str:
         """Create a minimal prompt for single-step decision."""
+        if self.config.compact_prompt:
+            # Compact peg string only; the ASCII diagram roughly doubles
+            # the input tokens at 7+ disks without improving accuracy.
+            return (f"You are solving Towers of Hanoi. Step {step_num}. "
+                    f"State: {state.get_state_string()}. "
+                    f"Goal: move all disks from {state.source} to {state.target}. "
+                    f"Respond ONLY with the next move in format FROM->TO "
+                    f'(e.g., "A->B"). Do not explain.')
+
         return f"""You are solving Towers of Hanoi. This is step {step_num}.
 
 Current state:
@@ -181,44 +588,221 @@ class FirstToAheadByKVoting:
 
     def __init__(self, config: MAKERConfig):
         self.config = config
+        _ensure_logging(config.verbose)
+        self.red_flagger = RedFlagger(config)  # Shared across voting agents
+        # Agents are stateless apart from the logging id, so one pooled
+        # instance serves every vote instead of one allocation per vote.
+        self._agent = VotingAgent(config, agent_id=0, red_flagger=self.red_flagger)
+        self._n_supported = True  # Cleared if the provider rejects n=
+        # Depth-1 speculation store: predicted-state string -> prefetched
+        # votes for the following step.
+        self._prefetch: Dict[str, List[Tuple[str, str]]] = {}
 
     def vote_on_move(self, state: GameState, step_num: int) -> Optional[Tuple[str, str]]:
         """
         Get consensus on next move using first-to-ahead-by-k voting.
         Returns the winning move or None if consensus cannot be reached.
+
+        Prefers a single completion call with n samples (one HTTP round
+        trip, shared prompt processing), then concurrent per-agent
+        batches when acompletion is available, then the sequential loop.
+        """
+        if self.config.oracle is not None:
+            # Closed-form shortcut: no sampling needed for oracle tasks
+            return self.config.oracle(state, step_num)
+
+        if self.config.use_n_param and self._n_supported and completion is not None:
+            try:
+                return self._vote_on_move_n_batched(state, step_num)
+            except Exception as e:
+                # Provider rejected the n parameter; remember and fall back
+                self._n_supported = False
+                logger.debug("  n-batched sampling unavailable (%s); falling back", e)
+
+        if acompletion is not None:
+            return asyncio.run(self._vote_on_move_scoped(state, step_num))
+        return self._vote_on_move_sequential(state, step_num)
+
+    def _vote_on_move_n_batched(self, state: GameState, step_num: int) -> Optional[Tuple[str, str]]:
+        """Batched voting via the provider's n parameter (k+1, then k)."""
+        votes = _VoteTally()
+        agents_sampled = 0
+        max_agents = 50  # Safety limit
+        agent = self._agent
+        prompt = agent._create_prompt(state, step_num)
+        complete = (completion if self.config.router is None
+                    else self.config.router.completion)
+
+        batch = self.config.k + 1
+        while agents_sampled < max_agents:
+            n = min(batch, max_agents - agents_sampled)
+            request = agent._request(prompt)
+            request["n"] = n
+            try:
+                response = complete(**request)
+            except Exception:
+                if "response_format" not in request:
+                    raise
+                response = complete(**agent._drop_schema(request))
+
+            for choice in response.choices:
+                response_text = choice.message.content.strip()
+                move = agent._extract_move(response_text, state, step_num, 0)
+                if move is not None:
+                    votes.add(move)
+
+            agents_sampled += n
+            batch = max(self.config.k, 1)  # Follow-up batches
+
+            leader = self._check_consensus(votes, agents_sampled)
+            if leader is not None:
+                return leader
+
+        return self._fallback_leader(votes, max_agents)
+
+    async def _vote_on_move_scoped(self, state: GameState,
+                                   step_num: int) -> Optional[Tuple[str, str]]:
+        """vote_on_move_async inside a loop-scoped client session.
+
+        vote_on_move spins up a fresh event loop per step, so the shared
+        async client has to be created and closed inside that same loop;
+        a client carried over from an earlier step would try to reuse
+        keep-alive connections bound to an already-closed loop.
+        """
+        async with _loop_scoped_aclient():
+            return await self.vote_on_move_async(state, step_num)
+
+    async def vote_on_move_async(self, state: GameState, step_num: int) -> Optional[Tuple[str, str]]:
+        """
+        Concurrent voting via acompletion. Votes are consumed as each
+        request finishes (FIRST_COMPLETED) and the remaining in-flight
+        requests are cancelled the moment the k-lead is reached, so no
+        tokens are generated for votes that will never be counted.
         """
-        votes: Dict[Tuple[str, str], int] = Counter()
+        votes = _VoteTally()
         agents_sampled = 0
         max_agents = 50  # Safety limit
+        batch_size = max(self.config.k + 1, 4)
+        # Identical for every agent this step; render once
+        prompt = self._agent._create_prompt(state, step_num)
+
+        # Votes speculatively sampled during the previous step; a state
+        # mismatch simply misses the dict and costs nothing.
+        for move in self._prefetch.pop(state.get_state_string(), ()):
+            if state.is_valid_move(move[0], move[1]):
+                agents_sampled += 1
+                votes.add(move)
+        leader = self._check_consensus(votes, agents_sampled)
+        if leader is not None:
+            return leader
+
+        spec_task = None
+        while agents_sampled < max_agents:
+            batch = min(batch_size, max_agents - agents_sampled)
+            pending = {
+                asyncio.create_task(
+                    self._agent.get_next_move_async(
+                        state, step_num, agent_id=agents_sampled + i,
+                        prompt=prompt))
+                for i in range(batch)}
+
+            leader = None
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        agents_sampled += 1
+                        move = task.result()
+                        if move is not None:
+                            votes.add(move)
+
+                    if (spec_task is None and self.config.speculate
+                            and votes.leader is not None
+                            and votes.lead >= self.config.k - 1):
+                        # Near-consensus: start sampling the next step
+                        # under the predicted state while this one ends.
+                        predicted = state.copy()
+                        if predicted.apply_move(*votes.leader):
+                            spec_task = asyncio.create_task(
+                                self._speculate(predicted, step_num + 1))
+
+                    leader = self._check_consensus(votes, agents_sampled)
+                    if leader is not None:
+                        break
+            finally:
+                # Abort whatever is still decoding; their votes are moot.
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+            if leader is not None:
+                if spec_task is not None:
+                    key, moves = await spec_task
+                    self._prefetch = {key: moves}  # Depth 1
+                return leader
+
+        if spec_task is not None:
+            spec_task.cancel()
+            await asyncio.gather(spec_task, return_exceptions=True)
+        return self._fallback_leader(votes, max_agents)
+
+    async def _speculate(self, predicted_state: GameState,
+                         step_num: int) -> Tuple[str, List[Tuple[str, str]]]:
+        """Sample k+1 votes for the predicted next state; results are
+        keyed by the state string so a misprediction is discarded."""
+        prompt = self._agent._create_prompt(predicted_state, step_num)
+        results = await asyncio.gather(
+            *[self._agent.get_next_move_async(
+                predicted_state, step_num, agent_id=-1, prompt=prompt)
+              for _ in range(self.config.k + 1)],
+            return_exceptions=True)
+        moves = [m for m in results
+                 if m is not None and not isinstance(m, BaseException)]
+        return predicted_state.get_state_string(), moves
+
+    def _vote_on_move_sequential(self, state: GameState, step_num: int) -> Optional[Tuple[str, str]]:
+        """Original sequential voting loop (no async litellm available)."""
+        votes = _VoteTally()
+        agents_sampled = 0
+        max_agents = 50  # Safety limit
+        # Identical for every agent this step; render once
+        prompt = self._agent._create_prompt(state, step_num)
 
         while agents_sampled < max_agents:
-            # Create agent and get vote
-            agent = VotingAgent(self.config, agent_id=agents_sampled)
-            move = agent.get_next_move(state, step_num)
+            move = self._agent.get_next_move(state, step_num,
+                                             agent_id=agents_sampled,
+                                             prompt=prompt)
+            agents_sampled += 1
 
             if move is not None:
-                votes[move] += 1
+                votes.add(move)
 
-                # Check if any move is ahead by k
-                if votes:
-                    sorted_votes = votes.most_common()
-                    if len(sorted_votes) >= 1:
-                        leader_move, leader_count = sorted_votes[0]
-                        second_count = sorted_votes[1][1] if len(sorted_votes) > 1 else 0
+                leader = self._check_consensus(votes, agents_sampled)
+                if leader is not None:
+                    return leader
 
-                        if leader_count - second_count >= self.config.k:
-                            if self.config.verbose:
-                                print(f"  Consensus reached after {agents_sampled + 1} agents: {leader_move[0]}->{leader_move[1]} ({leader_count} votes)")
-                            return leader_move
+        return self._fallback_leader(votes, max_agents)
 
-            agents_sampled += 1
+    def _check_consensus(self, votes: '_VoteTally', agents_sampled: int) -> Optional[Tuple[str, str]]:
+        """Return the leading move if it is ahead of the runner-up by k."""
+        if votes and votes.lead >= self.config.k:
+            leader_move = votes.leader
+            logger.debug("  Consensus reached after %d agents: %s->%s (%d votes)",
+                         agents_sampled, leader_move[0], leader_move[1],
+                         votes.leader_count)
+            return leader_move
+
+        return None
 
-        # No consensus reached
+    def _fallback_leader(self, votes: '_VoteTally', max_agents: int) -> Optional[Tuple[str, str]]:
+        """No k-lead emerged; fall back to the most common move."""
         if votes:
-            # Return most common
-            leader_move = votes.most_common(1)[0][0]
-            if self.config.verbose:
-                print(f"  No strong consensus after {max_agents} agents. Using most common: {leader_move[0]}->{leader_move[1]}")
+            # The tracked leader is the exact argmax of the counts
+            leader_move = votes.leader
+            logger.debug("  No strong consensus after %d agents. Using most common: %s->%s",
+                         max_agents, leader_move[0], leader_move[1])
             return leader_move
 
         return None
@@ -230,12 +814,17 @@ class MAKER:
     def __init__(self, config: MAKERConfig):
         self.config = config
         self.voting = FirstToAheadByKVoting(config)
+        if config.router is None:
+            config.router = _build_router(config)
         self.stats = {
             "total_steps": 0,
             "total_agent_calls": 0,
             "red_flags": 0,
             "failed_steps": 0,
         }
+        if config.response_cache is not None:
+            # Live view of the cache hit/miss counters
+            self.stats["cache"] = config.response_cache.stats
 
     def solve_towers_of_hanoi(self, num_disks: int) -> Tuple[bool, List[Tuple[str, str]], Dict]:
         """
@@ -260,11 +849,22 @@ class MAKER:
             step += 1
             self.stats["total_steps"] = step
 
-            if self.config.verbose:
-                print(f"\n--- Step {step}/{expected_moves} ---")
-
-            # Use voting to determine next move
-            move = self.voting.vote_on_move(state, step)
+            logger.debug("\n--- Step %d/%d ---", step, expected_moves)
+
+            # Forced-move fast path: when exactly one move is legal any
+            # solver must take it, so the voting round (k+1 LLM calls)
+            # is skipped entirely.
+            pegs = list(state.pegs)
+            legal = [(src, dst) for src in pegs for dst in pegs
+                     if src != dst and state.is_valid_move(src, dst)]
+            if len(legal) == 1:
+                move = legal[0]
+                self.stats["forced_steps"] = self.stats.get("forced_steps", 0) + 1
+                logger.debug("Forced move (only legal option): %s->%s",
+                             move[0], move[1])
+            else:
+                # Use voting to determine next move
+                move = self.voting.vote_on_move(state, step)
 
             if move is None:
                 print(f"ERROR: Could not determine move at step {step}")
@@ -281,9 +881,9 @@ class MAKER:
             moves.append(move)
 
             if self.config.verbose:
-                print(f"Applied: {move[0]}->{move[1]}")
+                logger.debug("Applied: %s->%s", move[0], move[1])
                 if step <= 5 or step % 10 == 0 or state.is_solved():
-                    print(f"\n{state}\n")
+                    logger.debug("\n%s\n", state)
 
         # Verify solution
         if state.is_solved():
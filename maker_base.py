@@ -4,16 +4,118 @@ Generalized MAKER implementation that works with any DecomposableTask.
 This is the framework from the paper, abstracted to work with any sequential task.
 """
 
+import asyncio
+import logging
+import logging.handlers
+import queue
 import math
+import re
 from typing import List, Tuple, Optional, Dict, Any, Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from collections import Counter
+from contextlib import asynccontextmanager
 from abc import ABC, abstractmethod
 
 try:
-    from litellm import completion
+    import litellm
+    from litellm import completion, acompletion
 except ImportError:
+    litellm = None
     completion = None
+    acompletion = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Compiled once: a single scan over the response replaces the per-call
+# python loop of substring tests (and the response.lower() copy).
+# Ordered by observed hit frequency (refusals dominate, "error:" and
+# "invalid:" are rare) so the alternation commits to the common branch
+# first.
+_FAILURE_PATTERNS = [
+    "i cannot", "i'm sorry", "i can't",
+    "i apologize", "i don't know", "error:", "invalid:"
+]
+_FAILURE_RE = re.compile(
+    "|".join(re.escape(p) for p in _FAILURE_PATTERNS), re.IGNORECASE)
+
+
+
+def _build_failure_db():
+    """Compile the failure patterns into a Hyperscan database, if available."""
+    if hyperscan is None:
+        return None
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[re.escape(p).encode() for p in _FAILURE_PATTERNS],
+        ids=list(range(len(_FAILURE_PATTERNS))),
+        flags=[hyperscan.HS_FLAG_CASELESS] * len(_FAILURE_PATTERNS),
+    )
+    return db
+
+
+_FAILURE_DB = _build_failure_db()
+
+
+def _failure_match(response: str):
+    """First failure pattern found in response, or None.
+
+    Uses the Hyperscan DFA (single SIMD scan over all patterns, caseless,
+    no lowercased copy) when the optional binding is installed, otherwise
+    the compiled re alternation.
+    """
+    if _FAILURE_DB is not None:
+        hits = []
+
+        def on_match(pat_id, start, end, flags, ctx=None):
+            hits.append(pat_id)
+            return True  # Terminate scan at the first hit
+
+        try:
+            _FAILURE_DB.scan(response.encode(), match_event_handler=on_match)
+        except hyperscan.ScanTerminated:
+            pass
+        if hits:
+            return _FAILURE_PATTERNS[hits[0]]
+        return None
+
+    match = _FAILURE_RE.search(response)
+    return match.group(0) if match else None
+
+
+logger = logging.getLogger("maker_base")
+_log_listener = None
+
+
+def _ensure_logging(verbose: bool) -> None:
+    """
+    Route log records through a background QueueListener so the hot
+    voting path never blocks on the stdout lock; stdio happens on the
+    listener thread. Idempotent — safe to call per MAKER instance.
+    """
+    global _log_listener
+    if _log_listener is None:
+        log_queue = queue.Queue(-1)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.propagate = False
+        _log_listener = logging.handlers.QueueListener(
+            log_queue, logging.StreamHandler())
+        _log_listener.start()
+    logger.setLevel(logging.DEBUG if verbose else logging.WARNING)
 
 
 @dataclass
@@ -33,6 +135,19 @@ class MAKERConfig:
     # Task-specific settings
     task_type: str = "generic"
     custom_validators: List[Callable] = None
+    response_cache: Optional[Any] = None  # LLMCache instance (see llm_cache.py)
+    # SemanticCache instance; leave None for correctness-sensitive runs
+    # since a near-duplicate hit can return an action for the wrong state.
+    semantic_cache: Optional[Any] = None
+    # Request n samples per HTTP call instead of one call per agent
+    # (shares prompt processing server-side); falls back to per-agent
+    # sampling on providers that reject the n parameter.
+    use_n_param: bool = True
+    # Provider routing: one long-lived Router reuses its HTTPS
+    # connection pool across the whole run; rpm/tpm feed its limits.
+    router: Optional[Any] = None  # Auto-built when litellm is available
+    rpm: Optional[int] = None
+    tpm: Optional[int] = None
 
     def __post_init__(self):
         if self.custom_validators is None:
@@ -78,6 +193,15 @@ class DecomposableTask(ABC):
         """
         return response.strip()
 
+    def mark_dead(self) -> None:
+        """
+        Hook: the solver failed to make progress at the current state.
+        Called when a step produces no applicable action. Override to
+        record dead ends (e.g. prune the state from future action
+        enumeration). Default is a no-op.
+        """
+        pass
+
     def get_progress(self) -> float:
         """Get completion percentage (0.0 to 1.0)."""
         return 0.0
@@ -93,6 +217,62 @@ class DecomposableTask(ABC):
         return False, "Task incomplete"
 
 
+
+@asynccontextmanager
+async def _loop_scoped_aclient():
+    """Install a pooled httpx client on litellm for the current loop.
+
+    litellm.aclient_session is process-global, but an AsyncClient binds
+    its connections to the event loop that first uses them; reusing one
+    across asyncio.run boundaries fails with "Event loop is closed" as
+    soon as a keep-alive connection is picked up on the next loop. This
+    scope installs a fresh client for requests made under the current
+    loop and closes it again before the loop goes away, restoring
+    whatever was previously assigned.
+    """
+    if litellm is None or httpx is None:
+        yield
+        return
+
+    previous = getattr(litellm, "aclient_session", None)
+    limits = httpx.Limits(max_keepalive_connections=64)
+    try:
+        client = httpx.AsyncClient(http2=True, limits=limits)
+    except ImportError:  # h2 not installed
+        client = httpx.AsyncClient(limits=limits)
+    litellm.aclient_session = client
+    try:
+        yield
+    finally:
+        litellm.aclient_session = previous
+        await client.aclose()
+
+
+def _build_router(config) -> Optional[Any]:
+    """
+    Build a long-lived litellm Router for this run.
+
+    A single Router keeps one HTTPS connection pool for every agent
+    request (one TLS handshake per run instead of per call) and applies
+    the configured rpm/tpm ceilings. The async client pool is managed
+    separately by _loop_scoped_aclient, since it must live and die with
+    an event loop rather than with the process.
+    """
+    if litellm is None:
+        return None
+
+    params = {"model": config.model}
+    if config.rpm is not None:
+        params["rpm"] = config.rpm
+    if config.tpm is not None:
+        params["tpm"] = config.tpm
+
+    return litellm.Router(
+        model_list=[{"model_name": config.model, "litellm_params": params}],
+        num_retries=3,
+        timeout=30,
+    )
+
 class RedFlagger:
     """Red-flagging for anomaly detection."""
 
@@ -103,27 +283,22 @@ class RedFlagger:
     def should_flag(self, response: str, context: Dict[str, Any]) -> Tuple[bool, str]:
         """Check if response should be red-flagged."""
 
-        # Length checks
-        if len(response) > self.config.max_response_length:
-            return True, f"Too long ({len(response)} chars)"
+        # Ordered by cost: O(1) length tests first, then single scans
+        n = len(response)
+        if n > self.config.max_response_length:
+            return True, f"Too long ({n} chars)"
 
-        if len(response) < self.config.min_response_length:
-            return True, f"Too short ({len(response)} chars)"
+        if n < self.config.min_response_length:
+            return True, f"Too short ({n} chars)"
 
-        # Empty check
-        if not response.strip():
+        # Whitespace-only; isspace is one pass with no stripped copy
+        if not response or response.isspace():
             return True, "Empty response"
 
-        # Failure patterns
-        failure_patterns = [
-            "i cannot", "i can't", "i don't know",
-            "i'm sorry", "i apologize", "error:", "invalid:"
-        ]
-
-        response_lower = response.lower()
-        for pattern in failure_patterns:
-            if pattern in response_lower:
-                return True, f"Failure pattern: {pattern}"
+        # Failure patterns (one multi-pattern scan)
+        pattern = _failure_match(response)
+        if pattern is not None:
+            return True, f"Failure pattern: {pattern.lower()}"
 
         # Custom validators
         for validator in self.config.custom_validators:
@@ -134,70 +309,263 @@ class RedFlagger:
         return False, ""
 
 
+class _VoteTally:
+    """
+    Incremental vote tally in structure-of-arrays form: actions are
+    interned to dense ids and counts live in one flat int array, so the
+    leader and runner-up update in O(1) per vote (no most_common() sort)
+    and, with numpy installed, a whole batch of votes lands in a single
+    np.add.at call.
+    """
+
+    __slots__ = ('counts', 'leader', 'leader_count', 'second_count',
+                 '_action_to_id', '_id_to_action')
+
+    def __init__(self):
+        self._action_to_id = {}
+        self._id_to_action = []
+        if np is not None:
+            self.counts = np.zeros(64, dtype=np.int32)
+        else:
+            self.counts = []
+        self.leader = None
+        self.leader_count = 0
+        self.second_count = 0
+
+    def _id_for(self, vote) -> int:
+        idx = self._action_to_id.get(vote)
+        if idx is None:
+            idx = len(self._id_to_action)
+            self._action_to_id[vote] = idx
+            self._id_to_action.append(vote)
+            if np is not None:
+                if idx >= len(self.counts):
+                    grown = np.zeros(len(self.counts) * 2, dtype=np.int32)
+                    grown[:len(self.counts)] = self.counts
+                    self.counts = grown
+            else:
+                self.counts.append(0)
+        return idx
+
+    def add(self, vote) -> None:
+        idx = self._id_for(vote)
+        new_count = int(self.counts[idx]) + 1
+        self.counts[idx] = new_count
+        if vote == self.leader:
+            self.leader_count = new_count
+        elif new_count > self.leader_count:
+            self.second_count = self.leader_count
+            self.leader, self.leader_count = vote, new_count
+        elif new_count > self.second_count:
+            self.second_count = new_count
+
+    def add_many(self, votes) -> None:
+        """Ingest a whole batch; one vectorized scatter-add with numpy."""
+        if np is None or len(votes) < 2:
+            for vote in votes:
+                self.add(vote)
+            return
+
+        ids = np.fromiter((self._id_for(v) for v in votes),
+                          dtype=np.int64, count=len(votes))
+        np.add.at(self.counts, ids, 1)
+        self._recompute_leaders()
+
+    def _recompute_leaders(self) -> None:
+        n = len(self._id_to_action)
+        counts = self.counts[:n]
+        idx = int(np.argmax(counts))
+        self.leader = self._id_to_action[idx]
+        self.leader_count = int(counts[idx])
+        self.second_count = int(np.partition(counts, -2)[-2]) if n > 1 else 0
+
+    @property
+    def lead(self) -> int:
+        return self.leader_count - self.second_count
+
+    def __bool__(self) -> bool:
+        return self.leader is not None
+
+
 class VotingAgent:
     """Individual agent that votes on next action."""
 
-    def __init__(self, config: MAKERConfig, task: DecomposableTask, agent_id: int):
+    def __init__(self, config: MAKERConfig, task: DecomposableTask, agent_id: int = 0,
+                 red_flagger: Optional[RedFlagger] = None):
         self.config = config
         self.task = task
-        self.agent_id = agent_id
-        self.red_flagger = RedFlagger(config, task)
+        self.agent_id = agent_id  # Default label; per-call agent_id overrides
+        # Share one flagger across agents when the caller provides it
+        self.red_flagger = (red_flagger if red_flagger is not None
+                            else RedFlagger(config, task))
 
-    def get_vote(self, step_num: int) -> Optional[Any]:
-        """Get this agent's vote for next action."""
+    def get_vote(self, step_num: int, agent_id: Optional[int] = None,
+                 prompt: Optional[str] = None) -> Optional[Any]:
+        """
+        Get this agent's vote for next action. agent_id is for log
+        attribution only; one agent instance serves the whole voting
+        loop. The caller may pass the prompt to avoid re-formatting the
+        identical string for every agent in a step.
+        """
 
         if completion is None:
             raise RuntimeError("litellm not installed")
 
-        # Get prompt from task
-        prompt = self.task.format_for_agent(step_num)
+        agent_id = self.agent_id if agent_id is None else agent_id
+
+        if prompt is None:
+            prompt = self.task.format_for_agent(step_num)
 
         # Try multiple times if red-flagged
         for attempt in range(self.config.max_resamples):
             try:
-                response = completion(
-                    model=self.config.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=self.config.temperature,
-                    max_tokens=200
-                )
-
-                response_text = response.choices[0].message.content.strip()
-
-                # Red-flag check
-                should_flag, reason = self.red_flagger.should_flag(
-                    response_text,
-                    {"step": step_num, "state": self.task.get_current_state()}
-                )
-
-                if should_flag:
-                    if self.config.verbose:
-                        print(f"  [Agent {self.agent_id}] Red-flagged: {reason}")
-                    continue
-
-                # Parse action
-                action = self.task.parse_action(response_text)
-                if action is None:
-                    if self.config.verbose:
-                        print(f"  [Agent {self.agent_id}] Failed to parse: '{response_text}'")
-                    continue
-
-                # Validate action is in possible set
-                possible = self.task.get_possible_actions()
-                if action not in possible:
-                    if self.config.verbose:
-                        print(f"  [Agent {self.agent_id}] Action not in possible set: {action}")
-                    continue
-
-                return action
+                response_text = self._complete(prompt)
+                action = self._extract_action(response_text, step_num,
+                                              agent_id=agent_id)
+                if action is not None:
+                    return action
+
+            except Exception as e:
+                logger.debug("  [Agent %s] Error: %s", agent_id, e)
+                continue
+
+        return None
+
+    def _cache_key(self, prompt: str) -> Optional[str]:
+        """Cache key for this request, or None when caching is disabled."""
+        cache = self.config.response_cache
+        if cache is None:
+            return None
+        return cache.make_key(
+            model=self.config.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=self.config.temperature,
+            max_tokens=200,
+        )
+
+    def _complete(self, prompt: str) -> str:
+        """Call the LLM, consulting the exact-match cache when configured."""
+        key = self._cache_key(prompt)
+        if key is not None:
+            cached = self.config.response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        semantic = self.config.semantic_cache
+        if semantic is not None:
+            cached = semantic.get(prompt)
+            if cached is not None:
+                return cached
+
+        complete = (completion if self.config.router is None
+                    else self.config.router.completion)
+        response = complete(
+            model=self.config.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=self.config.temperature,
+            max_tokens=200
+        )
+        response_text = response.choices[0].message.content.strip()
+
+        if key is not None:
+            self.config.response_cache.put(key, response_text)
+        if semantic is not None:
+            semantic.put(prompt, response_text)
+        return response_text
+
+    async def _complete_async(self, prompt: str) -> str:
+        """Async twin of _complete using acompletion."""
+        key = self._cache_key(prompt)
+        if key is not None:
+            cached = self.config.response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        semantic = self.config.semantic_cache
+        if semantic is not None:
+            cached = semantic.get(prompt)
+            if cached is not None:
+                return cached
+
+        # stream=True so cancelling this coroutine (on early consensus)
+        # stops the server-side decode instead of billing the full reply.
+        acomplete = (acompletion if self.config.router is None
+                     else self.config.router.acompletion)
+        response = await acomplete(
+            model=self.config.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=self.config.temperature,
+            max_tokens=200,
+            stream=True,
+        )
+        parts = []
+        async for chunk in response:
+            content = getattr(chunk.choices[0].delta, "content", None)
+            if content:
+                parts.append(content)
+        response_text = "".join(parts).strip()
+
+        if key is not None:
+            self.config.response_cache.put(key, response_text)
+        if semantic is not None:
+            semantic.put(prompt, response_text)
+        return response_text
+
+    async def get_vote_async(self, step_num: int,
+                             agent_id: Optional[int] = None,
+                             prompt: Optional[str] = None) -> Optional[Any]:
+        """Async variant of get_vote so voting can overlap agent RTTs."""
+
+        if acompletion is None:
+            raise RuntimeError("litellm not installed")
+
+        agent_id = self.agent_id if agent_id is None else agent_id
+        if prompt is None:
+            prompt = self.task.format_for_agent(step_num)
+
+        for attempt in range(self.config.max_resamples):
+            try:
+                response_text = await self._complete_async(prompt)
+                action = self._extract_action(response_text, step_num,
+                                              agent_id=agent_id)
+                if action is not None:
+                    return action
 
             except Exception as e:
-                if self.config.verbose:
-                    print(f"  [Agent {self.agent_id}] Error: {e}")
+                logger.debug("  [Agent %s] Error: %s", agent_id, e)
                 continue
 
         return None
 
+    def _extract_action(self, response_text: str, step_num: int,
+                        agent_id: Optional[int] = None) -> Optional[Any]:
+        """Red-flag, parse, and validate one raw response."""
+        agent_id = self.agent_id if agent_id is None else agent_id
+
+        # Red-flag check
+        should_flag, reason = self.red_flagger.should_flag(
+            response_text,
+            {"step": step_num, "state": self.task.get_current_state()}
+        )
+
+        if should_flag:
+            logger.debug("  [Agent %s] Red-flagged: %s", agent_id, reason)
+            return None
+
+        # Parse action
+        action = self.task.parse_action(response_text)
+        if action is None:
+            logger.debug("  [Agent %s] Failed to parse: %r", agent_id, response_text)
+            return None
+
+        # Validate action is in possible set
+        possible = self.task.get_possible_actions()
+        if action not in possible:
+            logger.debug("  [Agent %s] Action not in possible set: %s", agent_id, action)
+            return None
+
+        return action
+
 
 class FirstToAheadByKVoting:
     """First-to-ahead-by-k voting mechanism."""
@@ -205,43 +573,237 @@ class FirstToAheadByKVoting:
     def __init__(self, config: MAKERConfig, task: DecomposableTask):
         self.config = config
         self.task = task
+        _ensure_logging(config.verbose)
+        self.red_flagger = RedFlagger(config, task)  # Shared across agents
+        # Agents are stateless apart from the logging id, so one pooled
+        # instance serves every vote instead of one allocation per vote.
+        self._agent = VotingAgent(config, task, red_flagger=self.red_flagger)
+        self._n_supported = True  # Cleared if the provider rejects n=
 
     def vote(self, step_num: int) -> Optional[Any]:
         """
         Run voting to determine next action.
 
-        Returns winning action or None if no consensus.
+        Returns winning action or None if no consensus. Prefers a single
+        completion call with n samples, then concurrent per-agent batches
+        when acompletion is available, then the sequential loop.
+        """
+        possible = self.task.get_possible_actions()
+        if len(possible) == 1:
+            # Forced action: no need to sample agents at all
+            logger.debug("  Single legal action; skipping vote: %s", possible[0])
+            return possible[0]
+
+        if self.config.use_n_param and self._n_supported and completion is not None:
+            try:
+                return self._vote_n_batched(step_num)
+            except Exception as e:
+                # Provider rejected the n parameter; remember and fall back
+                self._n_supported = False
+                logger.debug("  n-batched sampling unavailable (%s); falling back", e)
+
+        if acompletion is not None:
+            return asyncio.run(self.vote_async(step_num))
+        if completion is not None:
+            return self._vote_threaded(step_num)
+        return self._vote_sequential(step_num)
+
+    async def vote_dispatched(self, step_num: int) -> Optional[Any]:
+        """vote() for callers already running inside an event loop.
+
+        Same dispatch order as vote(), but awaits the concurrent path
+        directly instead of spinning up a fresh loop per step.
+        """
+        possible = self.task.get_possible_actions()
+        if len(possible) == 1:
+            logger.debug("  Single legal action; skipping vote: %s", possible[0])
+            return possible[0]
+
+        if self.config.use_n_param and self._n_supported and completion is not None:
+            try:
+                return self._vote_n_batched(step_num)
+            except Exception as e:
+                self._n_supported = False
+                logger.debug("  n-batched sampling unavailable (%s); falling back", e)
+
+        if acompletion is not None:
+            return await self.vote_async(step_num)
+        if completion is not None:
+            return self._vote_threaded(step_num)
+        return self._vote_sequential(step_num)
+
+    def _vote_n_batched(self, step_num: int) -> Optional[Any]:
+        """Batched voting via the provider's n parameter (k+1, then k)."""
+        votes = _VoteTally()
+        agents_sampled = 0
+        max_agents = self.config.max_agents_per_vote
+        agent = self._agent
+        prompt = self.task.format_for_agent(step_num)
+        complete = (completion if self.config.router is None
+                    else self.config.router.completion)
+
+        batch = self.config.k + 1
+        while agents_sampled < max_agents:
+            n = min(batch, max_agents - agents_sampled)
+            response = complete(
+                model=self.config.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=self.config.temperature,
+                n=n,
+                max_tokens=200
+            )
+
+            batch_actions = []
+            for choice in response.choices:
+                response_text = choice.message.content.strip()
+                action = agent._extract_action(response_text, step_num)
+                if action is not None:
+                    batch_actions.append(action)
+            votes.add_many(batch_actions)
+
+            agents_sampled += n
+            batch = max(self.config.k, 1)  # Follow-up batches
+
+            leader = self._check_consensus(votes, agents_sampled)
+            if leader is not None:
+                return leader
+
+        return self._fallback_leader(votes)
+
+    async def vote_async(self, step_num: int) -> Optional[Any]:
+        """
+        Concurrent voting via acompletion. Votes are consumed as each
+        request finishes (FIRST_COMPLETED) and the remaining in-flight
+        requests are cancelled the moment the k-lead is reached, so no
+        tokens are generated for votes that will never be counted.
+        """
+        votes = _VoteTally()
+        agents_sampled = 0
+        max_agents = self.config.max_agents_per_vote
+        batch_size = max(self.config.k + 1, 4)
+        # Identical for every agent this step; format once
+        prompt = self.task.format_for_agent(step_num)
+
+        while agents_sampled < max_agents:
+            batch = min(batch_size, max_agents - agents_sampled)
+            pending = {
+                asyncio.create_task(
+                    self._agent.get_vote_async(
+                        step_num, agent_id=agents_sampled + i,
+                        prompt=prompt))
+                for i in range(batch)}
+
+            leader = None
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        agents_sampled += 1
+                        action = task.result()
+                        if action is not None:
+                            votes.add(action)
+
+                    leader = self._check_consensus(votes, agents_sampled)
+                    if leader is not None:
+                        break
+            finally:
+                # Abort whatever is still decoding; their votes are moot.
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+            if leader is not None:
+                return leader
+
+        return self._fallback_leader(votes)
+
+    def _vote_threaded(self, step_num: int) -> Optional[Any]:
+        """Concurrent voting over the blocking client via a thread pool.
+
+        Used when only the synchronous completion API is available: the
+        k samples are I/O-bound, so a small pool runs them in the time
+        of one. Workers are confined to the raw LLM call; red-flagging,
+        parsing and tallying all run on the calling thread as futures
+        complete, so task state is never read off that thread and a
+        straggler still in flight at consensus only finishes its HTTP
+        request -- its response is discarded when the pool is shut down
+        without waiting. As in _vote_n_batched, a flagged or
+        unparseable sample simply contributes no vote.
         """
-        votes: Dict[Any, int] = Counter()
+        votes = _VoteTally()
+        agents_sampled = 0
+        max_agents = self.config.max_agents_per_vote
+        batch_size = max(self.config.k + 1, 4)
+        # Identical for every agent this step; format once
+        prompt = self.task.format_for_agent(step_num)
+
+        pool = ThreadPoolExecutor(max_workers=batch_size)
+        try:
+            while agents_sampled < max_agents:
+                batch = min(batch_size, max_agents - agents_sampled)
+                futures = [pool.submit(self._agent._complete, prompt)
+                           for _ in range(batch)]
+
+                for future in as_completed(futures):
+                    agents_sampled += 1
+                    try:
+                        response_text = future.result()
+                    except Exception as e:
+                        logger.debug("  [Agent %s] Error: %s",
+                                     agents_sampled, e)
+                        continue
+                    action = self._agent._extract_action(
+                        response_text, step_num, agent_id=agents_sampled)
+                    if action is not None:
+                        votes.add(action)
+
+                    leader = self._check_consensus(votes, agents_sampled)
+                    if leader is not None:
+                        return leader
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return self._fallback_leader(votes)
+
+    def _vote_sequential(self, step_num: int) -> Optional[Any]:
+        """Original sequential voting loop (no async litellm available)."""
+        votes = _VoteTally()
         agents_sampled = 0
-        k = self.config.k
+        # Identical for every agent this step; format once
+        prompt = self.task.format_for_agent(step_num)
 
         while agents_sampled < self.config.max_agents_per_vote:
-            # Create agent and get vote
-            agent = VotingAgent(self.config, self.task, agents_sampled)
-            action = agent.get_vote(step_num)
+            action = self._agent.get_vote(step_num, agent_id=agents_sampled,
+                                          prompt=prompt)
+            agents_sampled += 1
 
             if action is not None:
-                votes[action] += 1
+                votes.add(action)
 
-                # Check for k-vote lead
-                if votes:
-                    sorted_votes = votes.most_common()
-                    leader, leader_count = sorted_votes[0]
-                    second_count = sorted_votes[1][1] if len(sorted_votes) > 1 else 0
+                leader = self._check_consensus(votes, agents_sampled)
+                if leader is not None:
+                    return leader
 
-                    if leader_count - second_count >= k:
-                        if self.config.verbose:
-                            print(f"  Consensus after {agents_sampled + 1} agents: {leader} ({leader_count} votes)")
-                        return leader
+        return self._fallback_leader(votes)
 
-            agents_sampled += 1
+    def _check_consensus(self, votes: '_VoteTally', agents_sampled: int) -> Optional[Any]:
+        """Return the leading action if it is ahead of the runner-up by k."""
+        if votes and votes.lead >= self.config.k:
+            leader = votes.leader
+            logger.debug("  Consensus after %d agents: %s (%d votes)",
+                         agents_sampled, leader, votes.leader_count)
+            return leader
 
-        # No strong consensus - return most common
+        return None
+
+    def _fallback_leader(self, votes: '_VoteTally') -> Optional[Any]:
+        """No k-lead emerged; fall back to the most common action."""
         if votes:
-            leader = votes.most_common(1)[0][0]
-            if self.config.verbose:
-                print(f"  No strong consensus. Using most common: {leader}")
+            # The tracked leader is the exact argmax of the counts
+            leader = votes.leader
+            logger.debug("  No strong consensus. Using most common: %s", leader)
             return leader
 
         return None
@@ -258,6 +820,8 @@ class GeneralizedMAKER:
         self.config = config
         self.task = task
         self.voting = FirstToAheadByKVoting(config, task)
+        if config.router is None:
+            config.router = _build_router(config)
 
         # Auto-compute k if not provided
         if self.config.k is None:
@@ -270,6 +834,9 @@ class GeneralizedMAKER:
             "failed_steps": 0,
             "red_flags": 0
         }
+        if config.response_cache is not None:
+            # Live view of the cache hit/miss counters
+            self.stats["cache"] = config.response_cache.stats
 
     @staticmethod
     def _compute_k(num_steps: int) -> int:
@@ -290,6 +857,21 @@ class GeneralizedMAKER:
         Returns:
             (success, action_history, stats)
         """
+        return asyncio.run(self.solve_async())
+
+    async def solve_async(self) -> Tuple[bool, List[Any], Dict]:
+        """
+        Async solve loop: the whole run shares one event loop, so the k
+        concurrent votes of every step go out without per-step loop
+        setup/teardown, and the prompt built by format_for_agent is
+        consumed by all agents of the step. The shared async client is
+        scoped to this loop, so repeated solve() calls in one process
+        each get a fresh pool instead of one bound to a closed loop.
+        """
+        async with _loop_scoped_aclient():
+            return await self._solve_loop()
+
+    async def _solve_loop(self) -> Tuple[bool, List[Any], Dict]:
         print(f"\n{'='*60}")
         print(f"Generalized MAKER Solver")
         print(f"Task type: {self.config.task_type}")
@@ -311,11 +893,13 @@ class GeneralizedMAKER:
                 print(f"\n--- Step {step} (Progress: {progress:.1%}) ---")
 
             # Vote on next action
-            action = self.voting.vote(step)
+            action = await self.voting.vote_dispatched(step)
 
             if action is None:
                 print(f"ERROR: Could not determine action at step {step}")
                 self.stats["failed_steps"] += 1
+                # Report the dead end so the task can prune this state
+                self.task.mark_dead()
                 break
 
             # Apply action
@@ -324,6 +908,7 @@ class GeneralizedMAKER:
             if not success:
                 print(f"ERROR: Failed to apply action at step {step}: {action}")
                 self.stats["failed_steps"] += 1
+                self.task.mark_dead()
                 break
 
             action_history.append(action)
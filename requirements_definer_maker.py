@@ -14,11 +14,32 @@ This is a META-MAKER application:
 """
 
 from typing import List, Tuple, Optional, Any, Dict, Set
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+import heapq
+import re
+
 from maker_base import DecomposableTask, GeneralizedMAKER, MAKERConfig
 
 
+def _substring_union(words: List[str]) -> "re.Pattern":
+    """One case-insensitive pattern matching any of the given substrings."""
+    return re.compile("|".join(map(re.escape, words)), re.IGNORECASE)
+
+
+# Quality-check vocabularies, compiled once; a single scan replaces one
+# .lower() allocation plus N substring passes per check
+_AMBIGUOUS_RE = _substring_union(
+    ["maybe", "might", "could", "possibly", "etc", "and so on"])
+_TESTABLE_RE = _substring_union(["must", "shall", "will", "can", "should"])
+_OVERSPEC_RE = _substring_union(
+    ["advanced", "sophisticated", "cutting-edge", "all possible"])
+
+# First integer in an LLM reply (responses are expected to be a bare
+# 1-based choice number; only the first match matters)
+_FIRST_INT = re.compile(r"\d+")
+
+
 class RequirementType(Enum):
     """Types of requirements to define."""
     CORE_PURPOSE = "core_purpose"
@@ -33,6 +54,12 @@ class RequirementType(Enum):
     ACCEPTANCE_CRITERIA = "acceptance_criteria"
 
 
+# Static prompt/export fragments, computed once instead of per render
+_PRIORITY_BAR = ['🔴' * i for i in range(6)]
+_PRIORITY_STARS = ['⭐' * i for i in range(6)]
+_TYPE_TITLE = {t: t.value.replace('_', ' ').title() for t in RequirementType}
+
+
 class RequirementStatus(Enum):
     """Status of requirement definition."""
     NEEDED = "needed"
@@ -41,7 +68,7 @@ class RequirementStatus(Enum):
     COMPLETE = "complete"
 
 
-@dataclass
+@dataclass(slots=True)
 class Requirement:
     """A single project requirement."""
     id: str
@@ -59,15 +86,20 @@ class Requirement:
     # Validation notes
     validation_notes: List[str] = None
 
+    # Derived: dependency ids as a frozenset for C-level subset checks
+    _deps_frozen: frozenset = field(init=False, repr=False, compare=False,
+                                    default=frozenset())
+
     def __post_init__(self):
         if self.validation_notes is None:
             self.validation_notes = []
+        self._deps_frozen = frozenset(self.depends_on)
 
     def __hash__(self):
         return hash(self.id)
 
 
-@dataclass
+@dataclass(slots=True)
 class RequirementAction:
     """Represents defining/refining a requirement."""
     requirement: Requirement
@@ -77,8 +109,10 @@ class RequirementAction:
         return f"{self.action}({self.requirement.id}: {self.requirement.type.value})"
 
     def __eq__(self, other):
-        return (isinstance(other, RequirementAction) and
-                self.requirement.id == other.requirement.id)
+        # Hot path: runs per vote as a tally-dict key; identity check
+        # first, exact type test instead of an MRO walk
+        return self is other or (type(other) is RequirementAction and
+                                 self.requirement.id == other.requirement.id)
 
     def __hash__(self):
         return hash(self.requirement.id)
@@ -121,34 +155,42 @@ class ProjectRequirementsTask(DecomposableTask):
         self.core_purpose = None
         self.explicit_non_goals = []  # Critical: what NOT to build
 
+        # Action cache: format_for_agent, parse_action and every voting
+        # agent ask for the same action list between state mutations
+        self._actions_cache: Optional[List["RequirementAction"]] = None
+        self._cache_dirty = True
+        self._suggest_cache: Dict[frozenset, List["RequirementAction"]] = {}
+
+        # Ready queue: requirements whose dependencies are satisfied,
+        # ordered by (-priority, insertion order). Entries for completed
+        # requirements are discarded lazily when popped.
+        self._ready_heap: List[Tuple[int, int, str]] = []
+        self._in_heap: Set[str] = set()
+        self._insert_seq: Dict[str, int] = {}
+
     def get_current_state(self) -> Dict:
         """Get current requirements state."""
+        summary = self._summarize()
         return {
             "total_requirements": len(self.requirements),
             "completed": len(self.completed_requirements),
             "remaining": len(self.requirements) - len(self.completed_requirements),
-            "by_type": self._count_by_type(),
-            "quality_score": self._calculate_quality_score(),
+            "by_type": summary["by_type"],
+            "quality_score": summary["quality_score"],
             "has_core_purpose": self.core_purpose is not None,
             "has_non_goals": len(self.explicit_non_goals) > 0
         }
 
-    def _count_by_type(self) -> Dict[str, int]:
-        """Count requirements by type."""
+    def _summarize(self) -> Dict:
+        """Type counts, completed count and quality score in one pass."""
         counts = {}
+        completed = 0
+        total_score = 0
         for req in self.requirements.values():
             type_name = req.type.value
             counts[type_name] = counts.get(type_name, 0) + 1
-        return counts
-
-    def _calculate_quality_score(self) -> float:
-        """Calculate overall requirements quality (0-1)."""
-        if not self.requirements:
-            return 0.0
-
-        total_score = 0
-        for req in self.requirements.values():
             if req.status == RequirementStatus.COMPLETE:
+                completed += 1
                 score = 0
                 if req.is_clear:
                     score += 0.33
@@ -158,10 +200,23 @@ class ProjectRequirementsTask(DecomposableTask):
                     score += 0.34
                 total_score += score
 
-        return total_score / len(self.requirements) if self.requirements else 0.0
+        quality = total_score / len(self.requirements) if self.requirements else 0.0
+        return {"by_type": counts, "completed": completed,
+                "quality_score": quality}
+
+    def _count_by_type(self) -> Dict[str, int]:
+        """Count requirements by type."""
+        return self._summarize()["by_type"]
+
+    def _calculate_quality_score(self) -> float:
+        """Calculate overall requirements quality (0-1)."""
+        return self._summarize()["quality_score"]
 
     def get_possible_actions(self) -> List[RequirementAction]:
         """Get next requirements to define/refine."""
+        if not self._cache_dirty:
+            return self._actions_cache
+
         actions = []
 
         # Phase 1: Must define core purpose first
@@ -174,7 +229,7 @@ class ProjectRequirementsTask(DecomposableTask):
                 priority=5,
                 depends_on=[]
             )
-            return [RequirementAction(req, "define")]
+            return self._fill_cache([RequirementAction(req, "define")])
 
         # Phase 2: Define explicit non-goals (what NOT to build)
         if len(self.explicit_non_goals) == 0:
@@ -186,34 +241,57 @@ class ProjectRequirementsTask(DecomposableTask):
                 priority=5,
                 depends_on=["core_purpose"]
             )
-            return [RequirementAction(req, "define")]
-
-        # Phase 3: Define other requirements
-        # Look for requirements that need definition
-        for req_id, req in self.requirements.items():
+            return self._fill_cache([RequirementAction(req, "define")])
+
+        # Phase 3: pull the highest-priority ready requirements from the
+        # heap (top 3 for voting), putting live entries back afterwards
+        popped = []
+        while self._ready_heap and len(actions) < 3:
+            entry = heapq.heappop(self._ready_heap)
+            req_id = entry[2]
             if req_id in self.completed_requirements:
+                self._in_heap.discard(req_id)  # Stale: drop permanently
                 continue
-
-            # Check dependencies
-            if all(dep in self.completed_requirements for dep in req.depends_on):
-                if req.status == RequirementStatus.NEEDED:
-                    actions.append(RequirementAction(req, "define"))
-                elif req.status == RequirementStatus.DRAFT:
-                    actions.append(RequirementAction(req, "validate"))
-                elif req.status == RequirementStatus.VALIDATED:
-                    actions.append(RequirementAction(req, "mark_complete"))
+            popped.append(entry)
+            req = self.requirements[req_id]
+            if req.status == RequirementStatus.NEEDED:
+                actions.append(RequirementAction(req, "define"))
+            elif req.status == RequirementStatus.DRAFT:
+                actions.append(RequirementAction(req, "validate"))
+            elif req.status == RequirementStatus.VALIDATED:
+                actions.append(RequirementAction(req, "mark_complete"))
+        for entry in popped:
+            heapq.heappush(self._ready_heap, entry)
 
         # If no existing requirements, suggest next types to define
         if not actions:
-            actions = self._suggest_next_requirements()
-
-        # Sort by priority
-        actions.sort(key=lambda a: a.requirement.priority, reverse=True)
-
-        return actions[:3]  # Top 3 for voting
+            actions = self._suggest_next_requirements()[:3]
+
+        return self._fill_cache(actions)  # Top 3 for voting
+
+    def _enqueue_if_ready(self, req: Requirement) -> None:
+        """Push a requirement onto the ready heap once its deps complete."""
+        if (req.id in self._in_heap or
+                req.id in self.completed_requirements or
+                not req._deps_frozen <= self.completed_requirements):
+            return
+        seq = self._insert_seq.setdefault(req.id, len(self._insert_seq))
+        heapq.heappush(self._ready_heap, (-req.priority, seq, req.id))
+        self._in_heap.add(req.id)
+
+    def _fill_cache(self, actions: List[RequirementAction]) -> List[RequirementAction]:
+        """Store the computed action list until the next mutation."""
+        self._actions_cache = actions
+        self._cache_dirty = False
+        return actions
 
     def _suggest_next_requirements(self) -> List[RequirementAction]:
         """Suggest next requirement types to define."""
+        key = frozenset(self.requirements)
+        cached = self._suggest_cache.get(key)
+        if cached is not None:
+            return cached
+
         suggestions = []
 
         # Suggested order for requirement definition
@@ -246,6 +324,7 @@ class ProjectRequirementsTask(DecomposableTask):
                 suggestions.append(RequirementAction(req, "define"))
                 break  # One at a time
 
+        self._suggest_cache[key] = suggestions
         return suggestions
 
     def apply_action(self, action: Any) -> bool:
@@ -253,6 +332,9 @@ class ProjectRequirementsTask(DecomposableTask):
         if not isinstance(action, RequirementAction):
             return False
 
+        # Any accepted action can change which actions are available
+        self._cache_dirty = True
+
         req = action.requirement
 
         if action.action == "define":
@@ -260,6 +342,8 @@ class ProjectRequirementsTask(DecomposableTask):
             req.status = RequirementStatus.DRAFT
             req.description = self._simulate_requirement_definition(req)
             self.requirements[req.id] = req
+            self._insert_seq.setdefault(req.id, len(self._insert_seq))
+            self._enqueue_if_ready(req)
 
             # Special handling
             if req.type == RequirementType.CORE_PURPOSE:
@@ -293,6 +377,11 @@ class ProjectRequirementsTask(DecomposableTask):
             req.status = RequirementStatus.COMPLETE
             self.completed_requirements.add(req.id)
             self.requirement_order.append(req.id)
+            self._in_heap.discard(req.id)
+            # Stream newly-unblocked dependents into the ready queue
+            for other in self.requirements.values():
+                if req.id in other.depends_on:
+                    self._enqueue_if_ready(other)
 
         return True
 
@@ -306,22 +395,16 @@ class ProjectRequirementsTask(DecomposableTask):
             return f"Sample requirement for {req.type.value}"
 
     def _check_clarity(self, req: Requirement) -> bool:
-        """Check if requirement is clear (no ambiguity)."""
-        # Check for ambiguous words
-        ambiguous_words = ["maybe", "might", "could", "possibly", "etc", "and so on"]
-        return not any(word in req.description.lower() for word in ambiguous_words)
+        """Check if requirement is clear (no ambiguous words)."""
+        return not _AMBIGUOUS_RE.search(req.description)
 
     def _check_testability(self, req: Requirement) -> bool:
-        """Check if requirement is testable."""
-        # Should have measurable outcomes
-        testable_indicators = ["must", "shall", "will", "can", "should"]
-        return any(word in req.description.lower() for word in testable_indicators)
+        """Check if requirement is testable (has measurable outcomes)."""
+        return bool(_TESTABLE_RE.search(req.description))
 
     def _check_minimality(self, req: Requirement) -> bool:
         """Check if requirement is minimal (not over-specified)."""
-        # Check for over-specification indicators
-        over_spec_indicators = ["advanced", "sophisticated", "cutting-edge", "all possible"]
-        return not any(phrase in req.description.lower() for phrase in over_spec_indicators)
+        return not _OVERSPEC_RE.search(req.description)
 
     def is_complete(self) -> bool:
         """Check if requirements are complete."""
@@ -364,7 +447,7 @@ class ProjectRequirementsTask(DecomposableTask):
             req = action.requirement
             action_info.append(
                 f"  {i}. {action.action.upper()}: {req.type.value}\n"
-                f"      Priority: {'🔴' * req.priority}\n"
+                f"      Priority: {_PRIORITY_BAR[req.priority]}\n"
                 f"      Status: {req.status.value}"
             )
 
@@ -389,17 +472,24 @@ Next actions to take:
 Which action should be taken next?
 Respond with just the number (1-{len(possible)}). No explanation."""
 
-    def parse_action(self, response: str) -> Optional[RequirementAction]:
-        """Parse LLM response into action."""
-        import re
-        numbers = re.findall(r'\d+', response)
+    def parse_action(self, response: str,
+                     possible: Optional[List[RequirementAction]] = None
+                     ) -> Optional[RequirementAction]:
+        """Parse LLM response into action.
 
-        if not numbers:
+        Callers that already hold the action list (rendered into the
+        prompt by format_for_agent) can pass it as `possible` to skip
+        the lookup; otherwise the cached list is used.
+        """
+        match = _FIRST_INT.search(response)
+
+        if not match:
             return None
 
         try:
-            choice = int(numbers[0])
-            possible = self.get_possible_actions()
+            choice = int(match.group())
+            if possible is None:
+                possible = self.get_possible_actions()
 
             if 1 <= choice <= len(possible):
                 return possible[choice - 1]
@@ -450,16 +540,20 @@ Respond with just the number (1-{len(possible)}). No explanation."""
 
         output.append("\n## Requirements by Type\n")
 
+        # Bucket completed requirements by type in one pass instead of
+        # re-filtering the full dict once per RequirementType
+        by_type: Dict[RequirementType, List[Requirement]] = {}
+        for req in self.requirements.values():
+            if req.status == RequirementStatus.COMPLETE:
+                by_type.setdefault(req.type, []).append(req)
+
         for req_type in RequirementType:
-            reqs = [
-                req for req in self.requirements.values()
-                if req.type == req_type and req.status == RequirementStatus.COMPLETE
-            ]
+            reqs = by_type.get(req_type)
 
             if reqs:
-                output.append(f"\n### {req_type.value.replace('_', ' ').title()}")
+                output.append(f"\n### {_TYPE_TITLE[req_type]}")
                 for req in sorted(reqs, key=lambda r: r.priority, reverse=True):
-                    priority_stars = "⭐" * req.priority
+                    priority_stars = _PRIORITY_STARS[req.priority]
                     output.append(f"\n**{req.id}** {priority_stars}")
                     output.append(f"{req.description}")
                     output.append(f"- Clear: {'✓' if req.is_clear else '✗'}")
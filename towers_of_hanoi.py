@@ -35,6 +35,10 @@ class GameState:
             target: [],
             auxiliary: []
         }
+        # Render caches, keyed by a version bumped on every applied move
+        self._version = 0
+        self._str_cache = (-1, "")
+        self._state_string_cache = (-1, "")
 
     def copy(self) -> 'GameState':
         """Create a deep copy of the game state."""
@@ -46,6 +50,9 @@ class GameState:
         new_state.pegs = {
             peg: disks.copy() for peg, disks in self.pegs.items()
         }
+        new_state._version = 0
+        new_state._str_cache = (-1, "")
+        new_state._state_string_cache = (-1, "")
         return new_state
 
     def is_valid_move(self, from_peg: str, to_peg: str) -> bool:
@@ -69,6 +76,7 @@ class GameState:
 
         disk = self.pegs[from_peg].pop()
         self.pegs[to_peg].append(disk)
+        self._version += 1  # Invalidate cached renderings
         return True
 
     def is_solved(self) -> bool:
@@ -78,7 +86,11 @@ class GameState:
                 not self.pegs[self.auxiliary])
 
     def __str__(self) -> str:
-        """Pretty print the game state."""
+        """Pretty print the game state (cached until the next move)."""
+        version, text = self._str_cache
+        if version == self._version:
+            return text
+
         lines = []
         max_height = max(len(disks) for disks in self.pegs.values())
 
@@ -95,11 +107,21 @@ class GameState:
 
         lines.append("-" * (len(lines[0]) if lines else 0))
         lines.append(" | ".join([self.source, self.auxiliary, self.target]))
-        return "\n".join(lines)
+        text = "\n".join(lines)
+        self._str_cache = (self._version, text)
+        return text
 
     def get_state_string(self) -> str:
-        """Get a compact string representation of the state."""
-        return f"{self.source}:{self.pegs[self.source]}, {self.auxiliary}:{self.pegs[self.auxiliary]}, {self.target}:{self.pegs[self.target]}"
+        """Get a compact string representation of the state (cached)."""
+        version, text = self._state_string_cache
+        if version == self._version:
+            return text
+
+        text = (f"{self.source}:{self.pegs[self.source]}, "
+                f"{self.auxiliary}:{self.pegs[self.auxiliary]}, "
+                f"{self.target}:{self.pegs[self.target]}")
+        self._state_string_cache = (self._version, text)
+        return text
 
 
 def parse_move(move_str: str) -> Optional[Tuple[str, str]]: